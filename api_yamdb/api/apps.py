@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        import api.authentication  # noqa: F401
+        import api.cache  # noqa: F401
+        import api.checks  # noqa: F401
+        import api.db  # noqa: F401
@@ -0,0 +1,94 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed, InvalidToken
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.cache import get_cache
+from user.models import CustomUser
+
+USER_KEY = 'api:user:{user_id}'
+# Everything permission checks read; other fields load on first access.
+SNAPSHOT_FIELDS = ('id', 'username', 'role', 'is_superuser', 'is_active')
+# Snapshot fields embedded into issued tokens for clients; authentication
+# does not trust them.
+TOKEN_CLAIMS = ('username', 'role', 'is_superuser')
+
+
+def issue_tokens(user):
+    """Return signed refresh and access tokens carrying the user's role."""
+    refresh = RefreshToken.for_user(user)
+    for claim in TOKEN_CLAIMS:
+        refresh[claim] = getattr(user, claim)
+    return {'refresh': str(refresh), 'access': str(refresh.access_token)}
+
+
+def user_from_snapshot(snapshot):
+    field_names = [
+        field.attname for field in CustomUser._meta.concrete_fields
+        if field.attname in snapshot
+    ]
+    return CustomUser.from_db(
+        'default', field_names, [snapshot[name] for name in field_names]
+    )
+
+
+def get_user_snapshot(user_id):
+    cache = get_cache()
+    key = USER_KEY.format(user_id=user_id)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = CustomUser.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).values(*SNAPSHOT_FIELDS).first()
+        if snapshot is None:
+            return None
+        cache.set(key, snapshot, settings.API_USER_CACHE_TIMEOUT)
+    return snapshot
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication serving users from a cached snapshot.
+
+    The returned user is a CustomUser with only SNAPSHOT_FIELDS loaded, so
+    role checks and author comparisons do not query the database. Role
+    and activity always come from the snapshot, never from token claims:
+    the snapshot is dropped on every change of the user, so demoted,
+    deactivated or deleted users lose access at once.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Token contained no recognizable user identification'
+            )
+        snapshot = get_user_snapshot(user_id)
+        if snapshot is None:
+            raise AuthenticationFailed(
+                'User not found', code='user_not_found'
+            )
+        if not snapshot['is_active']:
+            raise AuthenticationFailed(
+                'User is inactive', code='user_inactive'
+            )
+        return user_from_snapshot(snapshot)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def user_changed(sender, instance, using=None, **kwargs):
+    # After the commit, as API cache invalidation: a request in between
+    # would snapshot the old row again.
+    transaction.on_commit(
+        partial(get_cache().delete, USER_KEY.format(user_id=instance.pk)),
+        using=using
+    )
@@ -0,0 +1,334 @@
+"""Per-endpoint query count, latency and memory measurements.
+
+Every scenario is one request against the current database; the response
+cache is cleared before each request so that cold responses are measured,
+except in warm scenarios.
+Create scenarios insert rows, so run them against a seeded scratch database
+(see the seed_data command).
+"""
+import math
+import time
+import tracemalloc
+import uuid
+from collections import namedtuple
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from api.authentication import issue_tokens
+from api.cache import TITLES_GROUP, get_cache, invalidate
+from api.constants import ROLE_ADMIN
+from api.filters import TitleFilter
+from reviews.models import Category, Genre, Title
+
+CustomUser = get_user_model()
+
+API_URL = '/api/v1/'
+DEFAULT_ITERATIONS = 20
+DEFAULT_TOLERANCE = 0.5
+METRICS = ('queries', 'p50_ms', 'p95_ms', 'peak_kib')
+
+# name, HTTP method, client role, expected status, a builder returning
+# the URL and payload for (fixture, iteration), whether the cache is
+# kept between requests instead of cleared and settings to measure with
+# (opt-in features).
+Scenario = namedtuple(
+    'Scenario', 'name method role status build warm settings',
+    defaults=(False, None)
+)
+ROW_LISTS = {'API_ROW_LISTS': True}
+
+
+def new_user(fixture, prefix, idx, **kwargs):
+    name = f'bench_{prefix}_{fixture.run}_{idx}'
+    return CustomUser.objects.create(
+        username=name, email=f'{name}@yamdb.fake', **kwargs
+    )
+
+
+def review_create(fixture, idx):
+    # A user reviews a title only once, so every request gets a new author.
+    fixture.clients['fresh'] = fixture.client_for(
+        new_user(fixture, 'author', idx)
+    )
+    return f'titles/{fixture.title.pk}/reviews/', {
+        'text': 'Benchmark review', 'score': 7
+    }
+
+
+def token_create(fixture, idx):
+    user = new_user(fixture, 'token', idx, confirmation_code='benchmark')
+    return 'auth/token/', {
+        'username': user.username, 'confirmation_code': 'benchmark'
+    }
+
+
+def titles_after_write(fixture, idx):
+    # A title write retires cached list pages but not the other titles.
+    invalidate(TITLES_GROUP)
+    return 'titles/', None
+
+
+def reviews_url(fixture):
+    return f'titles/{fixture.title.pk}/reviews/'
+
+
+def comments_url(fixture):
+    return f'{reviews_url(fixture)}{fixture.review.pk}/comments/'
+
+
+SCENARIOS = (
+    Scenario('categories-list', 'get', 'anonymous', HTTPStatus.OK,
+             lambda f, i: ('categories/', None)),
+    Scenario('categories-create', 'post', 'admin', HTTPStatus.CREATED,
+             lambda f, i: ('categories/', {
+                 'name': 'Benchmark', 'slug': f'bench-{f.run}-{i}'
+             })),
+    Scenario('genres-list', 'get', 'anonymous', HTTPStatus.OK,
+             lambda f, i: ('genres/', None)),
+    Scenario('genres-create', 'post', 'admin', HTTPStatus.CREATED,
+             lambda f, i: ('genres/', {
+                 'name': 'Benchmark', 'slug': f'bench-{f.run}-{i}'
+             })),
+    Scenario('titles-list', 'get', 'anonymous', HTTPStatus.OK,
+             lambda f, i: ('titles/', None)),
+    Scenario('titles-top-rated', 'get', 'anonymous', HTTPStatus.OK,
+             lambda f, i: ('titles/?ordering=-rating&rating_min=5'
+                           '&year_min=2000', None)),
+    Scenario('titles-list-rows', 'get', 'anonymous', HTTPStatus.OK,
+             lambda f, i: ('titles/', None), settings=ROW_LISTS),
+    Scenario('titles-list-warm', 'get', 'anonymous', HTTPStatus.OK,
+             titles_after_write, warm=True,
+             settings={**ROW_LISTS, 'API_JSON_FRAGMENTS': True}),
+    Scenario('titles-no-count', 'get', 'anonymous', HTTPStatus.OK,
+             lambda f, i: ('titles/?count=false', None)),
+    Scenario('titles-cards', 'get', 'anonymous', HTTPStatus.OK,
+             lambda f, i: ('titles/?fields=id,name,year,rating,category',
+                           None)),
+    Scenario('titles-retrieve', 'get', 'anonymous', HTTPStatus.OK,
+             lambda f, i: (f'titles/{f.title.pk}/', None)),
+    Scenario('titles-create', 'post', 'admin', HTTPStatus.CREATED,
+             lambda f, i: ('titles/', f.title_data(i))),
+    Scenario('titles-bulk-create', 'post', 'admin', HTTPStatus.CREATED,
+             lambda f, i: ('titles/bulk/', [
+                 f.title_data(i) for _ in range(10)
+             ])),
+    Scenario('reviews-list', 'get', 'anonymous', HTTPStatus.OK,
+             lambda f, i: (reviews_url(f), None)),
+    Scenario('reviews-scores', 'get', 'anonymous', HTTPStatus.OK,
+             lambda f, i: (f'{reviews_url(f)}?fields=id,score,pub_date',
+                           None)),
+    Scenario('reviews-retrieve', 'get', 'anonymous', HTTPStatus.OK,
+             lambda f, i: (f'{reviews_url(f)}{f.review.pk}/', None)),
+    Scenario('reviews-create', 'post', 'fresh', HTTPStatus.CREATED,
+             review_create),
+    Scenario('comments-list', 'get', 'anonymous', HTTPStatus.OK,
+             lambda f, i: (comments_url(f), None)),
+    Scenario('comments-retrieve', 'get', 'anonymous', HTTPStatus.OK,
+             lambda f, i: (f'{comments_url(f)}{f.comment.pk}/', None)),
+    Scenario('comments-create', 'post', 'admin', HTTPStatus.CREATED,
+             lambda f, i: (comments_url(f), {'text': 'Benchmark comment'})),
+    Scenario('users-list', 'get', 'admin', HTTPStatus.OK,
+             lambda f, i: ('users/', None)),
+    Scenario('users-retrieve', 'get', 'admin', HTTPStatus.OK,
+             lambda f, i: (f'users/{f.admin.username}/', None)),
+    Scenario('users-create', 'post', 'admin', HTTPStatus.CREATED,
+             lambda f, i: ('users/', {
+                 'username': f'bench_new_{f.run}_{i}',
+                 'email': f'bench_new_{f.run}_{i}@yamdb.fake',
+             })),
+    Scenario('users-me', 'get', 'admin', HTTPStatus.OK,
+             lambda f, i: ('users/me/', None)),
+    Scenario('export-genre', 'get', 'admin', HTTPStatus.OK,
+             lambda f, i: ('export/genre/', None)),
+    Scenario('auth-signup', 'post', 'anonymous', HTTPStatus.OK,
+             lambda f, i: ('auth/signup/', {
+                 'username': f'bench_signup_{f.run}_{i}',
+                 'email': f'bench_signup_{f.run}_{i}@yamdb.fake',
+             })),
+    Scenario('auth-token', 'post', 'anonymous', HTTPStatus.OK,
+             token_create),
+)
+
+
+class Fixture:
+    """Objects and authenticated clients the scenarios refer to."""
+
+    def __init__(self):
+        self.run = uuid.uuid4().hex[:8]
+        self.title = Title.objects.filter(
+            reviews__comments__isnull=False
+        ).order_by('pk').first()
+        if self.title is None:
+            raise LookupError(
+                'The database has no title with reviews and comments.'
+            )
+        self.review = self.title.reviews.filter(
+            comments__isnull=False
+        ).order_by('pk').first()
+        self.comment = self.review.comments.order_by('pk').first()
+        self.category = Category.objects.order_by('pk').first()
+        self.genres = list(
+            Genre.objects.order_by('pk').values_list('slug', flat=True)[:2]
+        )
+        self.admin = new_user(self, 'admin', 0, role=ROLE_ADMIN)
+        self.clients = {
+            'anonymous': APIClient(),
+            'admin': self.client_for(self.admin),
+        }
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {issue_tokens(user)["access"]}'
+        )
+        return client
+
+    def title_data(self, idx):
+        return {
+            'name': f'Benchmark {idx}',
+            'year': 2000,
+            'genre': self.genres,
+            'category': self.category.slug,
+        }
+
+
+# Queries behind the list endpoints, for EXPLAIN: each should be a range
+# scan of a composite index delivering rows already in page order.
+PLAN_QUERIES = {
+    'reviews-list': lambda f: f.title.reviews.select_related('author')[:10],
+    'reviews-cursor': lambda f: f.title.reviews.order_by(
+        'pub_date', 'id'
+    )[:10],
+    'reviews-count': lambda f: f.title.reviews.values('pk'),
+    'comments-list': lambda f: f.review.comments.select_related(
+        'author'
+    )[:10],
+    'author-reviews': lambda f: f.review.author.review.order_by('pub_date'),
+    'titles-category-year': lambda f: Title.objects.filter(
+        category=f.category, year__gte=2000
+    ).order_by().values('pk'),
+    'titles-name': lambda f: Title.objects.order_by('name')[:10],
+    'titles-top-rated': lambda f: TitleFilter(
+        {'ordering': '-rating', 'rating_min': 5}, Title.objects.all()
+    ).qs[:10],
+    'titles-years': lambda f: TitleFilter(
+        {'ordering': 'year', 'year_min': 2000, 'year_max': 2010},
+        Title.objects.all()
+    ).qs[:10],
+    'titles-most-reviewed': lambda f: TitleFilter(
+        {'ordering': '-reviews', 'reviews_min': 1}, Title.objects.all()
+    ).qs[:10],
+}
+
+
+def query_plans(fixture):
+    return {
+        name: build(fixture).explain()
+        for name, build in PLAN_QUERIES.items()
+    }
+
+
+def percentile(values, share):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(share * len(ordered)) - 1, 0)]
+
+
+def send(fixture, scenario, idx, trace_memory=False):
+    """Send one request, return its duration, query count and peak memory.
+
+    Allocation tracing slows requests down, so the peak is only measured
+    with `trace_memory` and is None otherwise.
+    """
+    url, data = scenario.build(fixture, idx)
+    client = fixture.clients[scenario.role]
+    if not scenario.warm:
+        get_cache().clear()
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+    with CaptureQueriesContext(connection) as context:
+        start = time.perf_counter()
+        response = getattr(client, scenario.method)(
+            API_URL + url, data, format='json'
+        )
+        if response.streaming:
+            b''.join(response.streaming_content)
+        elapsed = time.perf_counter() - start
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    if response.status_code != scenario.status:
+        raise AssertionError(
+            f'{scenario.name}: {scenario.method.upper()} {url} answered '
+            f'{response.status_code} instead of {scenario.status}.'
+        )
+    return elapsed, len(context), peak
+
+
+def measure(fixture, scenario, iterations):
+    timings, queries = [], 0
+    with override_settings(**(scenario.settings or {})):
+        if scenario.warm:
+            send(fixture, scenario, iterations)
+        for idx in range(iterations):
+            elapsed, count, _ = send(fixture, scenario, idx)
+            timings.append(elapsed)
+            queries = max(queries, count)
+        _, _, peak = send(fixture, scenario, iterations, trace_memory=True)
+    return {
+        'queries': queries,
+        'p50_ms': round(percentile(timings, 0.5) * 1000, 2),
+        'p95_ms': round(percentile(timings, 0.95) * 1000, 2),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def run_benchmark(iterations=DEFAULT_ITERATIONS, names=None):
+    """Measure the scenarios (all or the given names) in declared order."""
+    scenarios = [
+        scenario for scenario in SCENARIOS
+        if not names or scenario.name in names
+    ]
+    with override_settings(
+        EMAIL_BACKEND='django.core.mail.backends.dummy.EmailBackend'
+    ):
+        fixture = Fixture()
+        return {
+            scenario.name: measure(fixture, scenario, iterations)
+            for scenario in scenarios
+        }
+
+
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Compare results with a baseline and describe every regression.
+
+    Query counts must not grow at all; median latency and memory may
+    exceed the baseline by `tolerance` (a share, 0.5 = 50%), None skips
+    them. p95 is only reported: a few milliseconds of scheduler noise make
+    it too unstable to fail on.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if metrics['queries'] > expected['queries']:
+            regressions.append(
+                f'{name}: {metrics["queries"]} queries, '
+                f'baseline {expected["queries"]}.'
+            )
+        if tolerance is None:
+            continue
+        for metric in ('p50_ms', 'peak_kib'):
+            limit = expected[metric] * (1 + tolerance)
+            if metrics[metric] > limit:
+                regressions.append(
+                    f'{name}: {metric} {metrics[metric]}, baseline '
+                    f'{expected[metric]} (limit {limit:.1f}).'
+                )
+    return regressions
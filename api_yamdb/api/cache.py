@@ -0,0 +1,236 @@
+import time
+from functools import partial
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag, urlencode
+from rest_framework.response import Response
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import rating_changed, review_deleting, stats_changed
+from user.models import CustomUser
+
+ANONYMOUS_ROLE = 'anonymous'
+CATEGORIES_GROUP = 'categories'
+GENRES_GROUP = 'genres'
+TITLES_GROUP = 'titles'
+CATALOGUE_GROUP = 'catalogue'
+VERSION_KEY = 'api:version:{group}'
+RESPONSE_KEY = 'api:response:{digest}'
+COUNT_KEY = 'api:count:{digest}'
+
+
+def title_group(title_id):
+    return f'title:{title_id}'
+
+
+def reviews_group(title_id):
+    return f'reviews:{title_id}'
+
+
+def comments_group(review_id):
+    return f'comments:{review_id}'
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def new_version():
+    # Versions are change timestamps in nanoseconds: they double as
+    # Last-Modified and never repeat after a version key is evicted.
+    return time.time_ns()
+
+
+def get_versions(cache, groups):
+    keys = [VERSION_KEY.format(group=group) for group in groups]
+    versions = cache.get_many(keys)
+    missing = {key: new_version() for key in keys if key not in versions}
+    if missing:
+        for key, version in missing.items():
+            cache.add(key, version, timeout=None)
+        missing.update(cache.get_many(list(missing)))
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*groups):
+    """Make every response cached for the groups unreachable."""
+    version = new_version()
+    get_cache().set_many(
+        {VERSION_KEY.format(group=group): version for group in groups},
+        timeout=None
+    )
+
+
+def invalidate_on_commit(*groups, using=None):
+    """invalidate() once the current transaction commits.
+
+    A GET between the version bump and the commit would read the old rows
+    and cache them, with their ETag, under the new versions.
+    """
+    transaction.on_commit(partial(invalidate, *groups), using=using)
+
+
+def response_digest(request, versions):
+    role = (
+        request.user.role if request.user.is_authenticated
+        else ANONYMOUS_ROLE
+    )
+    raw = '|'.join((
+        request.path,
+        request.META.get('QUERY_STRING', ''),
+        role,
+        ','.join(map(str, versions)),
+    ))
+    return md5(raw.encode()).hexdigest()
+
+
+def cached_count(request, groups, queryset, ignore=()):
+    """queryset.count(), cached per path, query parameters and versions.
+
+    Parameters in `ignore` (the page number) do not change the count.
+    """
+    cache = get_cache()
+    params = sorted(
+        (key, values) for key, values in request.query_params.lists()
+        if key not in ignore
+    )
+    raw = '|'.join((
+        request.path,
+        urlencode(params, doseq=True),
+        ','.join(map(str, get_versions(cache, groups))),
+    ))
+    key = COUNT_KEY.format(digest=md5(raw.encode()).hexdigest())
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, settings.API_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def cached_response(request, groups, get_response, store=True):
+    """Answer a GET from group versions, the cache or get_response().
+
+    A matching If-None-Match/If-Modified-Since gets 304 without building
+    the body; otherwise the body is taken from the cache when `store` is
+    set and the response is tagged with ETag and Last-Modified.
+    """
+    if request.method != 'GET':
+        return get_response()
+    cache = get_cache()
+    versions = get_versions(cache, groups)
+    digest = response_digest(request, versions)
+    etag = quote_etag(digest)
+    last_modified = max(versions) // 10 ** 9 if versions else None
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if not_modified is not None:
+        return not_modified
+    key = RESPONSE_KEY.format(digest=digest)
+    cached = cache.get(key) if store else None
+    if cached is not None:
+        response = Response(cached)
+    else:
+        response = get_response()
+        if response.status_code != 200:
+            return response
+        if store:
+            cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, using=None, **kwargs):
+    invalidate_on_commit(
+        CATEGORIES_GROUP, TITLES_GROUP, CATALOGUE_GROUP, using=using
+    )
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def genre_changed(sender, using=None, **kwargs):
+    invalidate_on_commit(
+        GENRES_GROUP, TITLES_GROUP, CATALOGUE_GROUP, using=using
+    )
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(sender, instance, using=None, **kwargs):
+    invalidate_on_commit(TITLES_GROUP, title_group(instance.pk), using=using)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         using=None, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate_on_commit(
+            TITLES_GROUP, title_group(instance.pk), using=using
+        )
+        return
+    invalidate_on_commit(
+        TITLES_GROUP, *(title_group(pk) for pk in pk_set or ()), using=using
+    )
+    if action == 'post_clear':
+        invalidate_on_commit(CATALOGUE_GROUP, using=using)
+
+
+@receiver(rating_changed)
+@receiver(stats_changed)
+def title_counters_changed(sender, title_id, **kwargs):
+    if title_id is None:
+        invalidate_on_commit(TITLES_GROUP, CATALOGUE_GROUP)
+        return
+    invalidate_on_commit(TITLES_GROUP, title_group(title_id))
+
+
+@receiver(post_save, sender=Review)
+def review_changed(sender, instance, using=None, **kwargs):
+    invalidate_on_commit(reviews_group(instance.title_id), using=using)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, using=None, **kwargs):
+    invalidate_on_commit(
+        reviews_group(instance.title_id), comments_group(instance.pk),
+        using=using
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, using=None, **kwargs):
+    if not review_deleting(instance.review_id):
+        invalidate_on_commit(comments_group(instance.review_id), using=using)
+
+
+@receiver(post_save, sender=CustomUser)
+def username_changed(sender, instance, created, using=None, **kwargs):
+    """Drop cached reviews and comments showing the old username."""
+    old_username = getattr(instance, '_loaded_username', instance.username)
+    instance._loaded_username = instance.username
+    if created or old_username == instance.username:
+        return
+    title_ids = Review.objects.using(using).filter(
+        author_id=instance.pk
+    ).values_list('title_id', flat=True).distinct()
+    review_ids = Comment.objects.using(using).filter(
+        author_id=instance.pk
+    ).values_list('review_id', flat=True).distinct()
+    groups = [reviews_group(title_id) for title_id in title_ids]
+    groups += [comments_group(review_id) for review_id in review_ids]
+    if groups:
+        invalidate_on_commit(*groups, using=using)
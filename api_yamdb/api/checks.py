@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Backends whose entries live in the memory of one process.
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """Warn when the API cache is not shared between workers.
+
+    Invalidation only bumps the group versions of the writing process:
+    other workers would keep serving stale responses and user snapshots
+    and count throttled requests on their own.
+    """
+    backend = settings.CACHES[settings.API_CACHE_ALIAS]['BACKEND']
+    if backend not in PROCESS_LOCAL_BACKENDS:
+        return []
+    return [Warning(
+        f'The API cache "{settings.API_CACHE_ALIAS}" uses {backend}, '
+        'which is local to one process.',
+        hint=(
+            'Set CACHE_BACKEND=memcached and CACHE_LOCATION when running '
+            'more than one worker.'
+        ),
+        id='api.W001',
+    )]
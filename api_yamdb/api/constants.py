@@ -3,6 +3,8 @@ MAX_SLUG_CHAR = 50
 MAX_LENGTH_FIRST_LAST_AND_USERNAME = 150
 MAX_ROLE_LENGTH = 60
 MAX_STR_LENGTH = 15
+MIN_SCORE = 1
+MAX_SCORE = 10
 
 ROLE_USER = 'user'
 ROLE_MODERATOR = 'moderator'
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply SQLITE_PRAGMAS to every new SQLite connection."""
+    if connection.vendor != 'sqlite':
+        return
+    # The raw connection keeps these statements out of query logs and
+    # request metrics.
+    for pragma, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {pragma} = {value}')
+
+
+@receiver(request_started)
+def check_persistent_connections(sender, **kwargs):
+    """Drop kept-alive connections the server has closed meanwhile.
+
+    Without the check the first query of a request would fail on a
+    connection killed by a database restart or an idle timeout.
+    """
+    if not settings.DB_HEALTH_CHECKS:
+        return
+    for connection in connections.all():
+        if (connection.connection is not None
+                and connection.settings_dict['CONN_MAX_AGE']
+                and not connection.is_usable()):
+            connection.close()
@@ -0,0 +1,66 @@
+from django.utils.encoding import smart_str
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+
+class SlugLookupField(serializers.SlugRelatedField):
+    """SlugRelatedField that avoids a query per slug.
+
+    With many=True all slugs of the value are fetched in one query. Bulk
+    views resolve every slug of a request up front and put the objects into
+    context['slug_lookup'][model][slug]; then no query is made at all.
+    """
+
+    def get_lookup(self):
+        return self.context.get('slug_lookup', {}).get(self.queryset.model)
+
+    def fetch_lookup(self, slugs):
+        queryset = self.get_queryset().filter(
+            **{f'{self.slug_field}__in': slugs}
+        )
+        return {
+            smart_str(getattr(obj, self.slug_field)): obj for obj in queryset
+        }
+
+    def from_lookup(self, lookup, data):
+        if not isinstance(data, (str, int)):
+            self.fail('invalid')
+        try:
+            return lookup[smart_str(data)]
+        except KeyError:
+            self.fail(
+                'does_not_exist',
+                slug_name=self.slug_field,
+                value=smart_str(data)
+            )
+
+    def to_internal_value(self, data):
+        lookup = self.get_lookup()
+        if lookup is None:
+            return super().to_internal_value(data)
+        return self.from_lookup(lookup, data)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return SlugLookupManyField(**list_kwargs)
+
+
+class SlugLookupManyField(serializers.ManyRelatedField):
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        child = self.child_relation
+        lookup = child.get_lookup()
+        if lookup is None:
+            lookup = child.fetch_lookup([
+                smart_str(item) for item in data
+                if isinstance(item, (str, int))
+            ])
+        return [child.from_lookup(lookup, item) for item in data]
@@ -1,18 +1,77 @@
-from django_filters.rest_framework import CharFilter, FilterSet
+from django.db.models import F
+from django_filters.rest_framework import (
+    CharFilter, FilterSet, NumberFilter, OrderingFilter
+)
 
 from reviews.models import Title
+from reviews.search import search_titles
 from user.models import CustomUser
 
 
+class TieBreakOrderingFilter(OrderingFilter):
+    """Ordering ending with a unique key, so equal values page stably.
+
+    The key follows the direction of the first field and, for fields of a
+    related table, comes from `tie_breaks`: an index on (field, key) then
+    delivers rows in the requested order without a sort. NULLs of the
+    `nulls_last` fields come last in both directions, whatever the
+    database puts first by default.
+    """
+
+    def __init__(self, *args, tie_breaks=None, nulls_last=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tie_breaks = tie_breaks or {}
+        self.nulls_last = nulls_last
+
+    def order_expression(self, ordering):
+        field = ordering.lstrip('-')
+        if field not in self.nulls_last:
+            return ordering
+        if ordering.startswith('-'):
+            return F(field).desc(nulls_last=True)
+        return F(field).asc(nulls_last=True)
+
+    def filter(self, qs, value):
+        ordering = [
+            self.get_ordering_value(param) for param in value or () if param
+        ]
+        if not ordering:
+            return qs
+        first = ordering[0].lstrip('-')
+        tie_break = self.tie_breaks.get(first, 'pk')
+        if ordering[0].startswith('-'):
+            tie_break = '-' + tie_break
+        return qs.order_by(*map(self.order_expression, ordering), tie_break)
+
+
 class TitleFilter(FilterSet):
     category = CharFilter(field_name='category__slug')
     name = CharFilter(lookup_expr='icontains')
     genre = CharFilter(field_name='genre__slug')
+    search = CharFilter(method='filter_search')
+    year_min = NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = NumberFilter(field_name='year', lookup_expr='lte')
+    rating_min = NumberFilter(field_name='rating', lookup_expr='gte')
+    reviews_min = NumberFilter(
+        field_name='stats__review_count', lookup_expr='gte'
+    )
+    # Stored, indexed columns only; declared after `search`, so an explicit
+    # ordering replaces the relevance order.
+    ordering = TieBreakOrderingFilter(fields=(
+        ('rating', 'rating'),
+        ('year', 'year'),
+        ('name', 'name'),
+        ('stats__review_count', 'reviews'),
+    ), tie_breaks={'stats__review_count': 'stats__title_id'},
+        nulls_last=('rating',))
 
     class Meta:
         model = Title
         fields = ['year']
 
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
 
 class CustomUserFilter(FilterSet):
     username = CharFilter(
@@ -0,0 +1,126 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmark import (
+    DEFAULT_ITERATIONS, DEFAULT_TOLERANCE, METRICS, SCENARIOS, Fixture,
+    find_regressions, query_plans, run_benchmark
+)
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmark_baseline.json'
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure query counts, latency and peak memory of the API '
+        'endpoints and fail on regressions against a stored baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'scenarios',
+            nargs='*',
+            help='Scenarios to run, all of them by default.'
+        )
+        parser.add_argument(
+            '--iterations',
+            default=DEFAULT_ITERATIONS,
+            type=int,
+            help='Number of timed requests per scenario.'
+        )
+        parser.add_argument(
+            '--baseline',
+            default=DEFAULT_BASELINE,
+            type=Path,
+            help='JSON file with the expected metrics.'
+        )
+        parser.add_argument(
+            '--update-baseline',
+            action='store_true',
+            help='Store the results as the new baseline instead of checking.'
+        )
+        parser.add_argument(
+            '--tolerance',
+            default=DEFAULT_TOLERANCE,
+            type=float,
+            help='Allowed latency and memory growth, 0.5 means 50%%.'
+        )
+        parser.add_argument(
+            '--queries-only',
+            action='store_true',
+            help='Check only query counts, e.g. on shared CI machines.'
+        )
+        parser.add_argument(
+            '--explain',
+            action='store_true',
+            help='Print the query plans of the list queries and exit.'
+        )
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be a positive number.')
+        names = {scenario.name for scenario in SCENARIOS}
+        unknown = set(options['scenarios']) - names
+        if unknown:
+            raise CommandError(
+                f'Unknown scenarios: {", ".join(sorted(unknown))}. '
+                f'Choose from {", ".join(sorted(names))}.'
+            )
+        if options['explain']:
+            self.print_plans()
+            return
+        try:
+            results = run_benchmark(
+                options['iterations'], options['scenarios']
+            )
+        except (AssertionError, LookupError) as error:
+            raise CommandError(error)
+        self.print_results(results)
+        baseline_path = options['baseline']
+        if options['update_baseline']:
+            self.update_baseline(baseline_path, results, options['scenarios'])
+            return
+        if not baseline_path.exists():
+            raise CommandError(
+                f'Baseline {baseline_path} does not exist, '
+                'create it with --update-baseline.'
+            )
+        regressions = find_regressions(
+            results,
+            json.loads(baseline_path.read_text()),
+            None if options['queries_only'] else options['tolerance']
+        )
+        if regressions:
+            raise CommandError(
+                'Performance regressions:\n' + '\n'.join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS('No regressions.'))
+
+    def update_baseline(self, baseline_path, results, partial):
+        baseline = {}
+        if baseline_path.exists() and partial:
+            baseline = json.loads(baseline_path.read_text())
+        baseline.update(results)
+        baseline_path.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + '\n'
+        )
+        self.stdout.write(f'Baseline written to {baseline_path}.')
+
+    def print_plans(self):
+        try:
+            plans = query_plans(Fixture())
+        except LookupError as error:
+            raise CommandError(error)
+        for name, plan in plans.items():
+            self.stdout.write(f'{name}:\n{plan}\n')
+
+    def print_results(self, results):
+        self.stdout.write(f'{"scenario":<20}' + ''.join(
+            f'{metric:>10}' for metric in METRICS
+        ))
+        for name, metrics in results.items():
+            self.stdout.write(f'{name:<20}' + ''.join(
+                f'{metrics[metric]:>10}' for metric in METRICS
+            ))
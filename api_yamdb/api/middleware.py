@@ -0,0 +1,203 @@
+import json
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager, nullcontext
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('api.requests')
+
+DUPLICATES_LOGGED = 10
+COUNTER_FIELDS = (
+    'requests', 'slow', 'queries', 'db_ms', 'serialize_ms', 'render_ms',
+    'total_ms', 'bytes'
+)
+
+_counters = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+_counters_lock = threading.Lock()
+
+
+def get_counters():
+    """Totals per `view.action` collected by this process."""
+    with _counters_lock:
+        return {name: dict(values) for name, values in _counters.items()}
+
+
+def reset_counters():
+    with _counters_lock:
+        _counters.clear()
+
+
+class RequestMetrics:
+    """Queries, DB, serialization and render time of a single request."""
+
+    def __init__(self):
+        self.endpoint = None
+        self.statements = Counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.render_start = None
+        self.render_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def duplicates(self):
+        return [
+            {'sql': sql, 'count': count}
+            for sql, count in self.statements.most_common(DUPLICATES_LOGGED)
+            if count > 1
+        ]
+
+    @contextmanager
+    def serializing(self):
+        start, db_time = time.perf_counter(), self.db_time
+        try:
+            yield
+        finally:
+            # Queries of lazily loaded relations stay in the DB time.
+            self.serialize_time += (
+                time.perf_counter() - start - (self.db_time - db_time)
+            )
+
+    def rendered(self, response):
+        self.render_time = time.perf_counter() - self.render_start
+
+
+def endpoint_name(view_func, method):
+    """`ViewClass.action` of a DRF view, the function name otherwise."""
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return f'{view_func.__module__}.{view_func.__name__}'
+    actions = getattr(view_func, 'actions', None) or {}
+    return f'{view_class.__name__}.{actions.get(method, method)}'
+
+
+def measure_serialization(request):
+    """Count the block as serialization time of a measured request."""
+    metrics = getattr(request, 'metrics', None)
+    if metrics is None:
+        return nullcontext()
+    return metrics.serializing()
+
+
+@contextmanager
+def measure_queries(metrics):
+    """Pass the queries of every connection through `metrics`."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics))
+        yield
+
+
+class RequestMetricsMiddleware:
+    """Measure every request and report what it cost.
+
+    Serializers report their own time through measure_serialization();
+    render time covers encoding the data into bytes only.
+    Responses get a Server-Timing header when API_SERVER_TIMING is set,
+    totals per view and action are kept in process counters and requests
+    slower than API_SLOW_REQUEST_MS are logged to `api.requests` as JSON,
+    with the statements that ran more than once (the N+1 suspects).
+    Streaming responses are reported once their content is consumed, so
+    the queries of an export count too; their headers are sent by then,
+    so they get no Server-Timing.
+    """
+
+    def __init__(self, get_response):
+        if not settings.API_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = request.metrics = RequestMetrics()
+        start = time.perf_counter()
+        with measure_queries(metrics):
+            response = self.get_response(request)
+        if response.streaming:
+            response.streaming_content = self.stream(
+                request, response, metrics, start, response.streaming_content
+            )
+            return response
+        self.report(
+            request, response, metrics, time.perf_counter() - start,
+            len(response.content)
+        )
+        return response
+
+    def stream(self, request, response, metrics, start, content):
+        size = 0
+        try:
+            with measure_queries(metrics):
+                for chunk in content:
+                    size += len(chunk)
+                    yield chunk
+        finally:
+            self.report(
+                request, response, metrics, time.perf_counter() - start,
+                size
+            )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics.endpoint = endpoint_name(
+            view_func, request.method.lower()
+        )
+
+    def process_template_response(self, request, response):
+        # The response is rendered right after the template response
+        # middleware, so this brackets encoding into bytes.
+        request.metrics.render_start = time.perf_counter()
+        response.add_post_render_callback(request.metrics.rendered)
+        return response
+
+    def report(self, request, response, metrics, total_time, size):
+        db_ms = metrics.db_time * 1000
+        serialize_ms = metrics.serialize_time * 1000
+        render_ms = metrics.render_time * 1000
+        total_ms = total_time * 1000
+        slow = total_ms >= settings.API_SLOW_REQUEST_MS
+        app_ms = total_ms - db_ms - serialize_ms - render_ms
+        if settings.API_SERVER_TIMING and not response.streaming:
+            response['Server-Timing'] = ', '.join((
+                f'db;dur={db_ms:.1f};desc="{metrics.queries} queries"',
+                f'serialize;dur={serialize_ms:.1f}',
+                f'render;dur={render_ms:.1f}',
+                f'app;dur={max(app_ms, 0):.1f}',
+                f'total;dur={total_ms:.1f}',
+            ))
+        endpoint = metrics.endpoint or 'unresolved'
+        with _counters_lock:
+            counters = _counters[endpoint]
+            counters['requests'] += 1
+            counters['slow'] += slow
+            counters['queries'] += metrics.queries
+            counters['db_ms'] += db_ms
+            counters['serialize_ms'] += serialize_ms
+            counters['render_ms'] += render_ms
+            counters['total_ms'] += total_ms
+            counters['bytes'] += size
+        if slow:
+            logger.warning('Slow request %s', json.dumps({
+                'endpoint': endpoint,
+                'method': request.method,
+                'path': request.get_full_path(),
+                'status': response.status_code,
+                'total_ms': round(total_ms, 1),
+                'db_ms': round(db_ms, 1),
+                'serialize_ms': round(serialize_ms, 1),
+                'render_ms': round(render_ms, 1),
+                'queries': metrics.queries,
+                'bytes': size,
+                'duplicates': metrics.duplicates(),
+            }, ensure_ascii=False))
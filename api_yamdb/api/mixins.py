@@ -1,6 +1,23 @@
-from rest_framework import filters
+from http import HTTPStatus
 
-from api.permissions import IsAdminOrReadOnly
+from django.conf import settings
+from django.core.exceptions import (
+    FieldDoesNotExist, ValidationError as DjangoValidationError
+)
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils.functional import cached_property
+from rest_framework import filters, serializers
+from rest_framework.decorators import action
+from rest_framework.relations import (
+    ManyRelatedField, PrimaryKeyRelatedField, SlugRelatedField
+)
+from rest_framework.response import Response
+
+from api.cache import cached_response, invalidate
+from api.middleware import measure_serialization
+from api.permissions import IsAdmin, IsAdminOrReadOnly
+from api.renderers import ORJSONRenderer
 
 
 class SearchAndPermissionsMixin:
@@ -8,3 +25,298 @@ class SearchAndPermissionsMixin:
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     permission_classes = (IsAdminOrReadOnly,)
+
+
+def split_names(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def related_columns(field):
+    """Columns a relation field reads from the related model, None for all."""
+    if isinstance(field, ManyRelatedField):
+        field = field.child_relation
+    if isinstance(field, SlugRelatedField):
+        return [field.slug_field]
+    if isinstance(field, PrimaryKeyRelatedField):
+        return []
+    return None
+
+
+def sparse_prefetch(name, model_field, keys):
+    related = model_field.related_model.objects.all()
+    return Prefetch(name, queryset=related.only(*keys) if keys else related)
+
+
+def sparse_queryset(queryset, fields, columns=()):
+    """Load only what `fields` render: columns, joins and prefetches."""
+    model = queryset.model
+    columns, joins, prefetches = list(columns), [], []
+    for field in fields:
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation:
+            columns.append(field.source)
+            continue
+        keys = related_columns(field)
+        if model_field.many_to_many:
+            prefetches.append(sparse_prefetch(field.source, model_field, keys))
+            continue
+        if model_field.concrete:
+            columns.append(field.source)
+            if keys == []:
+                continue
+        joins.append(field.source)
+        columns.extend(f'{field.source}__{key}' for key in keys or ())
+    return narrow_queryset(queryset, columns, joins, prefetches)
+
+
+def narrow_queryset(queryset, columns, joins, prefetches):
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if joins:
+        queryset = queryset.select_related(*joins)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    if columns:
+        queryset = queryset.only(*columns)
+    return queryset
+
+
+class SparseFieldsMixin:
+    """Let GET requests choose fields with `?fields=` and `?expand=`.
+
+    `fields` lists the top-level fields to return. Relations the serializer
+    can collapse are then rendered as slugs unless named in `expand`, which
+    also selects them; without `fields` the response is the full one. The
+    queryset is narrowed to match: other columns are deferred and joins or
+    prefetches of unused relations are dropped.
+    `sparse_columns` are always loaded, e.g. for the pagination cursor.
+    """
+
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+    sparse_columns = ()
+
+    @cached_property
+    def sparse_fields(self):
+        """Requested (fields, expand) name sets, None for a full response."""
+        params = self.request.query_params
+        if self.request.method != 'GET' or not (
+            self.fields_query_param in params
+            or self.expand_query_param in params
+        ):
+            return None
+        serializer_class = self.get_serializer_class()
+        available = list(serializer_class().fields)
+        fields = split_names(params.get(self.fields_query_param, ''))
+        expand = split_names(params.get(self.expand_query_param, ''))
+        errors = {}
+        unknown = set(fields) - set(available)
+        if unknown:
+            errors[self.fields_query_param] = [
+                f'Unknown fields: {", ".join(sorted(unknown))}.'
+            ]
+        unknown = set(expand) - set(serializer_class.collapsed_fields)
+        if unknown:
+            errors[self.expand_query_param] = [
+                f'Cannot expand: {", ".join(sorted(unknown))}.'
+            ]
+        if errors:
+            raise serializers.ValidationError(errors)
+        if self.fields_query_param not in params:
+            # Relations are only collapsed in a sparse response: alone,
+            # `expand` has nothing to expand.
+            return None
+        return set(fields or available) | set(expand), set(expand)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.sparse_fields is not None:
+            context['fields'], context['expand'] = self.sparse_fields
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.sparse_fields is None:
+            return queryset
+        serializer = self.get_serializer_class()(
+            context=self.get_serializer_context()
+        )
+        return sparse_queryset(
+            queryset, serializer.fields.values(), self.sparse_columns
+        )
+
+
+class RowListMixin:
+    """Render list pages with `row_serializer_class` from values() rows.
+
+    Used for full GET lists while API_ROW_LISTS is on; sparse requests
+    (`?fields=`/`?expand=`) still go through the serializer. Rows of a
+    serializer with a `fragment_name` are encoded item by item through the
+    fragment cache when API_JSON_FRAGMENTS is on and the response is
+    rendered by ORJSONRenderer.
+    """
+
+    row_serializer_class = None
+
+    def use_rows(self):
+        return (
+            settings.API_ROW_LISTS
+            and self.row_serializer_class is not None
+            and getattr(self, 'sparse_fields', None) is None
+        )
+
+    def use_fragments(self, serializer):
+        return (
+            settings.API_JSON_FRAGMENTS
+            and serializer.fragment_name is not None
+            and isinstance(self.request.accepted_renderer, ORJSONRenderer)
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_rows():
+            return super().list(request, *args, **kwargs)
+        serializer = self.row_serializer_class()
+        build = (
+            serializer.encode if self.use_fragments(serializer)
+            else serializer.represent
+        )
+        rows = serializer.get_rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        # Encoded fragments are built here too and count as serialization.
+        with measure_serialization(request):
+            data = build(rows if page is None else page)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+
+class CachedListMixin:
+    """Serve list responses from the API response cache.
+
+    Responses carry ETag/Last-Modified built from the versions of
+    `cache_groups`; set `store_responses` to False to keep only the
+    conditional GET handling.
+    """
+
+    cache_groups = ()
+    store_responses = True
+
+    def get_cache_groups(self):
+        return self.cache_groups
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request,
+            self.get_cache_groups(),
+            lambda: super(CachedListMixin, self).list(
+                request, *args, **kwargs
+            ),
+            self.store_responses
+        )
+
+
+class CachedResponseMixin(CachedListMixin):
+    """Serve list and retrieve responses from the API response cache."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(
+            request,
+            self.get_cache_groups(),
+            lambda: super(CachedResponseMixin, self).retrieve(
+                request, *args, **kwargs
+            ),
+            self.store_responses
+        )
+
+
+class BulkWriteMixin:
+    """Add admin-only POST/PATCH `bulk/` taking a list of items.
+
+    All items are validated first and written in one transaction; a bad
+    request gets 400 with one error object per item, in request order.
+    PATCH items are matched by `bulk_lookup_field`.
+    """
+
+    bulk_serializer_class = None
+    bulk_lookup_field = 'slug'
+    bulk_cache_groups = ()
+
+    def perform_bulk_save(self, serializer):
+        serializer.save()
+
+    def get_slug_lookup(self, items):
+        """Map model -> slug -> instance for slugs referenced by items."""
+        return {}
+
+    def get_bulk_key(self, field, item):
+        """Return the lookup value of an item as stored, or raise."""
+        if not isinstance(item, dict) or self.bulk_lookup_field not in item:
+            raise serializers.ValidationError('This field is required.')
+        key = item[self.bulk_lookup_field]
+        if isinstance(key, bool) or not isinstance(key, (str, int)):
+            raise serializers.ValidationError('Invalid value.')
+        try:
+            return field.to_python(key)
+        except DjangoValidationError as error:
+            raise serializers.ValidationError(error.messages)
+
+    def get_bulk_instances(self, items):
+        queryset = self.get_queryset()
+        field = queryset.model._meta.get_field(self.bulk_lookup_field)
+        keys, errors = [], []
+        for item in items:
+            try:
+                key = self.get_bulk_key(field, item)
+            except serializers.ValidationError as exc:
+                key, error = None, exc.detail
+            else:
+                # Two updates of one row would clash in the bulk writes.
+                error = ['Duplicate value.'] if key in keys else None
+            keys.append(None if error else key)
+            errors.append({self.bulk_lookup_field: error} if error else {})
+        found = queryset.in_bulk(
+            [key for key in keys if key is not None],
+            field_name=self.bulk_lookup_field
+        )
+        for key, error in zip(keys, errors):
+            if not error and key not in found:
+                error[self.bulk_lookup_field] = ['Not found.']
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return [found[key] for key in keys]
+
+    @action(
+        detail=False,
+        methods=['post', 'patch'],
+        permission_classes=(IsAdmin,)
+    )
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise serializers.ValidationError(
+                {'non_field_errors': ['Expected a list of items.']}
+            )
+        instances = None
+        if request.method == 'PATCH':
+            instances = self.get_bulk_instances(items)
+        context = self.get_serializer_context()
+        context['slug_lookup'] = self.get_slug_lookup(items)
+        serializer = self.bulk_serializer_class(
+            instances,
+            data=items,
+            many=True,
+            partial=instances is not None,
+            context=context
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            self.perform_bulk_save(serializer)
+        invalidate(*self.bulk_cache_groups)
+        return Response(
+            serializer.data,
+            status=(
+                HTTPStatus.CREATED if instances is None else HTTPStatus.OK
+            )
+        )
@@ -0,0 +1,160 @@
+from collections import OrderedDict
+
+from django.core.paginator import Page, Paginator
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination, CursorPagination, PageNumberPagination
+)
+from rest_framework.response import Response
+
+from api.cache import cached_count
+
+CURSOR_MODE = 'cursor'
+FALSE_VALUES = ('0', 'false', 'no', 'off')
+
+
+class CountedPaginator(Paginator):
+    """Paginator taking the number of objects from `get_count()`."""
+
+    def __init__(self, object_list, per_page, get_count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.get_count = get_count
+
+    @cached_property
+    def count(self):
+        return self.get_count()
+
+
+class CountedPageNumberPagination(PageNumberPagination):
+    """Page numbers without a COUNT(*) query on every page.
+
+    The total comes from the view's `get_page_count()` when it gives one
+    (denormalized counters); otherwise the count is cached per path,
+    filters and cache group versions of the view for
+    API_COUNT_CACHE_TIMEOUT seconds. Views without cache groups count on
+    every page. `?count=false` leaves the total out
+    of the response: one extra row is read to tell if a next page exists.
+    """
+
+    count_query_param = 'count'
+
+    def include_count(self, request):
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() not in FALSE_VALUES
+
+    def get_count(self, queryset):
+        view = self.view
+        count = None
+        if hasattr(view, 'get_page_count'):
+            count = view.get_page_count()
+        if count is not None:
+            return count
+        groups = view.get_cache_groups() if hasattr(
+            view, 'get_cache_groups'
+        ) else ()
+        if not groups:
+            # Nothing would retire a cached count of this list.
+            return queryset.count()
+        return cached_count(
+            self.request, groups, queryset,
+            ignore=(self.page_query_param, self.count_query_param)
+        )
+
+    def django_paginator_class(self, object_list, per_page):
+        # Called by PageNumberPagination.paginate_queryset.
+        return CountedPaginator(
+            object_list, per_page, lambda: self.get_count(object_list)
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request, self.view = request, view
+        self.with_count = self.include_count(request)
+        if not self.with_count:
+            return self.paginate_without_count(queryset, request)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_page_number(self, request, paginator):
+        page_number = request.query_params.get(self.page_query_param, 1)
+        if page_number in self.last_page_strings and not self.with_count:
+            raise NotFound(self.invalid_page_message)
+        return super().get_page_number(request, paginator)
+
+    def paginate_without_count(self, queryset, request):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        try:
+            number = int(self.get_page_number(request, None))
+        except (TypeError, ValueError):
+            number = 0
+        if number < 1:
+            raise NotFound(self.invalid_page_message)
+        offset = (number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and number > 1:
+            raise NotFound(self.invalid_page_message)
+        # The rows read so far are a lower bound that is enough for the
+        # previous/next links.
+        paginator = CountedPaginator(
+            queryset, page_size, lambda: offset + len(rows)
+        )
+        self.page = Page(rows[:page_size], number, paginator)
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        if self.with_count:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+
+class PubDateCursorPagination(CursorPagination):
+    """Keyset pagination over (pub_date, id) without OFFSET and COUNT(*)."""
+
+    ordering = ('pub_date', 'id')
+
+
+class PubDatePagination(BasePagination):
+    """Page numbers by default, cursor pages on `?pagination=cursor`.
+
+    A request carrying a `cursor` parameter keeps using cursor pages, so the
+    `next`/`previous` links returned in cursor mode stay valid.
+    """
+
+    mode_query_param = 'pagination'
+    page_number_class = CountedPageNumberPagination
+    cursor_class = PubDateCursorPagination
+
+    def __init__(self):
+        self.page_number = self.page_number_class()
+        self.cursor = self.cursor_class()
+        self.active = self.page_number
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == CURSOR_MODE
+            or self.cursor.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.active = (
+            self.cursor if self.use_cursor(request) else self.page_number
+        )
+        return self.active.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.active.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number.get_paginated_response_schema(schema)
+
+    @property
+    def display_page_controls(self):
+        return self.active.display_page_controls
+
+    def to_html(self):
+        return self.active.to_html()
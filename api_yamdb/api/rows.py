@@ -0,0 +1,196 @@
+"""List representations built straight from values() rows.
+
+Row serializers skip the per-field dispatch of DRF serializers on list
+pages. Each one must render exactly what its read serializer renders for
+the same object; tests/test_26_row_lists.py compares the two byte by byte.
+"""
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from rest_framework import serializers
+
+from api.cache import (
+    CATALOGUE_GROUP, CATEGORIES_GROUP, GENRES_GROUP, get_cache,
+    get_versions, title_group
+)
+from api.renderers import EncodedList, dumps
+from reviews.models import Title, TitleStats
+
+FRAGMENT_KEY = 'api:fragment:{name}:{key}:{versions}'
+
+datetime_representation = serializers.DateTimeField().to_representation
+
+
+class RowSerializer(ABC):
+    """Fetch `values` of a queryset and represent every row as a dict.
+
+    With a `fragment_name` the encoded items can be cached one by one:
+    the cache key holds the versions of `fragment_groups(row)`, so every
+    change that invalidates those groups also retires the fragment.
+    """
+
+    values = ()
+    fragment_name = None
+    fragment_key_field = 'id'
+
+    def get_rows(self, queryset):
+        return queryset.prefetch_related(None).values(*self.values)
+
+    @abstractmethod
+    def to_representation(self, row):
+        """The dict the read serializer renders for the row."""
+
+    def represent(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+    def fragment_groups(self, row):
+        return ()
+
+    def fragment_keys(self, cache, rows):
+        row_groups = [self.fragment_groups(row) for row in rows]
+        groups = list(dict.fromkeys(
+            group for groups in row_groups for group in groups
+        ))
+        versions = dict(zip(groups, get_versions(cache, groups)))
+        return [
+            FRAGMENT_KEY.format(
+                name=self.fragment_name,
+                key=row[self.fragment_key_field],
+                versions='.'.join(str(versions[group]) for group in own)
+            )
+            for row, own in zip(rows, row_groups)
+        ]
+
+    def encode(self, rows):
+        """EncodedList of the rows, reusing items encoded before."""
+        rows = list(rows)
+        cache = get_cache()
+        keys = self.fragment_keys(cache, rows)
+        fragments = cache.get_many(keys)
+        missing = [
+            (key, row) for key, row in zip(keys, rows)
+            if key not in fragments
+        ]
+        if missing:
+            encoded = {
+                key: dumps(item) for (key, _), item in zip(
+                    missing, self.represent([row for _, row in missing])
+                )
+            }
+            cache.set_many(encoded, settings.API_CACHE_TIMEOUT)
+            fragments.update(encoded)
+        return EncodedList(fragments[key] for key in keys)
+
+
+class CategoryRowSerializer(RowSerializer):
+    values = ('name', 'slug')
+    fragment_name = 'category'
+    fragment_key_field = 'slug'
+
+    def fragment_groups(self, row):
+        return (CATEGORIES_GROUP,)
+
+    def to_representation(self, row):
+        return {'name': row['name'], 'slug': row['slug']}
+
+
+class GenreRowSerializer(CategoryRowSerializer):
+    fragment_name = 'genre'
+
+    def fragment_groups(self, row):
+        return (GENRES_GROUP,)
+
+
+class TitleRowSerializer(RowSerializer):
+    """Rows of TitleGetSerializer; genres are read with one extra query."""
+
+    fragment_name = 'title'
+
+    SCORE_VALUES = {
+        str(score): f'stats__{TitleStats.score_field(score)}'
+        for score in TitleStats.SCORES
+    }
+    values = (
+        'id', 'name', 'year', 'description', 'rating',
+        'category__name', 'category__slug',
+        'stats__review_count', 'stats__comment_count',
+        'stats__last_activity', *SCORE_VALUES.values()
+    )
+
+    def fragment_groups(self, row):
+        return (CATALOGUE_GROUP, title_group(row['id']))
+
+    def get_genres(self, title_ids):
+        genres = {title_id: [] for title_id in title_ids}
+        if not genres:
+            return genres
+        rows = Title.genre.through.objects.filter(
+            title_id__in=title_ids
+        ).order_by('genre_id').values_list(
+            'title_id', 'genre__name', 'genre__slug'
+        )
+        for title_id, name, slug in rows:
+            genres[title_id].append({'name': name, 'slug': slug})
+        return genres
+
+    def represent(self, rows):
+        rows = list(rows)
+        self.genres = self.get_genres([row['id'] for row in rows])
+        return super().represent(rows)
+
+    def to_representation(self, row):
+        category = None
+        if row['category__slug'] is not None:
+            category = {
+                'name': row['category__name'], 'slug': row['category__slug']
+            }
+        stats = None
+        if row['stats__review_count'] is not None:
+            stats = {
+                'review_count': row['stats__review_count'],
+                'comment_count': row['stats__comment_count'],
+                'scores': {
+                    score: row[value]
+                    for score, value in self.SCORE_VALUES.items()
+                },
+                'last_activity': datetime_representation(
+                    row['stats__last_activity']
+                ),
+            }
+        return {
+            'id': row['id'],
+            'genre': self.genres[row['id']],
+            'category': category,
+            'stats': stats,
+            'name': row['name'],
+            'year': row['year'],
+            'description': row['description'],
+            'rating': row['rating'],
+        }
+
+
+class ReviewRowSerializer(RowSerializer):
+    values = ('id', 'author__username', 'score', 'title', 'text', 'pub_date')
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'author': row['author__username'],
+            'score': row['score'],
+            'title': row['title'],
+            'text': row['text'],
+            'pub_date': datetime_representation(row['pub_date']),
+        }
+
+
+class CommentRowSerializer(RowSerializer):
+    values = ('id', 'author__username', 'review', 'text', 'pub_date')
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'author': row['author__username'],
+            'review': row['review'],
+            'text': row['text'],
+            'pub_date': datetime_representation(row['pub_date']),
+        }
@@ -1,64 +1,255 @@
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.shortcuts import get_object_or_404
+from django.db import connections, router
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers, exceptions, validators
 
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.models import (
+    Category, Comment, Genre, Review, Title, TitleStats
+)
 from api.constants import (
     MAX_LENGTH_FIRST_LAST_AND_USERNAME,
-    MAX_STRING_CHAR, ROLE_USER, ROLES
-)
-from user.utils import (
-    username_validator,
-    confirmation_code_generator,
+    MAX_SCORE, MAX_SLUG_CHAR, MAX_STRING_CHAR, MIN_SCORE, ROLE_USER, ROLES
 )
+from api.authentication import issue_tokens
+from api.fields import SlugLookupField
+from api.middleware import measure_serialization
+from user.utils import username_validator
 
 
 CustomUser = get_user_model()
 
 
-class CategorySerializer(serializers.ModelSerializer):
+def save_new(model, instances, need_pks):
+    """Insert new instances with one query where the pks come back."""
+    connection = connections[router.db_for_write(model)]
+    if not need_pks or connection.features.can_return_rows_from_bulk_insert:
+        model.objects.bulk_create(instances)
+        return
+    for instance in instances:
+        instance.save()
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """Create or update a list of instances with bulk queries.
+
+    Many-to-many values are written with a single bulk insert into the
+    through table. bulk_create/bulk_update send no model signals, so the
+    calling view is responsible for cache invalidation.
+    """
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        instances, relations = [], []
+        for attrs in validated_data:
+            relations.append(self.pop_many_to_many(model, attrs))
+            instances.append(model(**attrs))
+        save_new(
+            model,
+            instances,
+            need_pks=(
+                bool(model._meta.many_to_many) or 'id' in self.child.fields
+            )
+        )
+        self.set_many_to_many(model, instances, relations)
+        return instances
+
+    def update(self, instances, validated_data):
+        model = self.child.Meta.model
+        fields, relations = set(), []
+        for instance, attrs in zip(instances, validated_data):
+            relations.append(self.pop_many_to_many(model, attrs))
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+                fields.add(attr)
+        if fields:
+            model.objects.bulk_update(instances, fields)
+        self.set_many_to_many(model, instances, relations, replace=True)
+        return instances
+
+    def pop_many_to_many(self, model, attrs):
+        return {
+            field: attrs.pop(field.name)
+            for field in model._meta.many_to_many if field.name in attrs
+        }
+
+    def set_many_to_many(self, model, instances, relations, replace=False):
+        for field in model._meta.many_to_many:
+            through = field.remote_field.through
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+            changed = [
+                (instance, relation[field])
+                for instance, relation in zip(instances, relations)
+                if field in relation
+            ]
+            if not changed:
+                continue
+            if replace:
+                through.objects.filter(**{
+                    f'{source}__in': [instance.pk for instance, _ in changed]
+                }).delete()
+            through.objects.bulk_create([
+                through(**{f'{source}_id': instance.pk, f'{target}_id': pk})
+                for instance, objs in changed
+                for pk in dict.fromkeys(obj.pk for obj in objs)
+            ])
+        if model._meta.many_to_many:
+            for instance in instances:
+                instance.__dict__.pop('_prefetched_objects_cache', None)
+            prefetch_related_objects(
+                instances, *(field.name for field in model._meta.many_to_many)
+            )
+
+
+class SlugBulkListSerializer(BulkListSerializer):
+    """Check new slugs of a bulk create against the table in one query."""
+
+    def to_internal_value(self, data):
+        attrs = super().to_internal_value(data)
+        if self.instance is not None:
+            return attrs
+        model = self.child.Meta.model
+        slugs = [item['slug'] for item in attrs]
+        taken = set(
+            model.objects.filter(slug__in=slugs).values_list('slug', flat=True)
+        )
+        errors, seen = [], set()
+        for slug in slugs:
+            if slug in taken or slug in seen:
+                errors.append(
+                    {'slug': [f'{model.__name__} with this slug exists.']}
+                )
+            else:
+                errors.append({})
+            seen.add(slug)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs
+
+
+class MeasuredSerializerMixin:
+    """Count representing top-level objects as serialization time.
+
+    Items of a list are measured one by one; nested serializers run inside
+    their parent's measurement.
+    """
+
+    def to_representation(self, instance):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return super().to_representation(instance)
+        with measure_serialization(self.context.get('request')):
+            return super().to_representation(instance)
+
+
+class SparseFieldsSerializerMixin:
+    """Serialize only the fields a view put in `context['fields']`.
+
+    Relations named in `collapsed_fields` (name -> slug field) are rendered
+    as slugs instead of nested objects unless listed in `context['expand']`.
+    Without `context['fields']` every field is serialized as declared.
+    """
+
+    collapsed_fields = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.context.get('fields')
+        if selected is None:
+            return fields
+        expand = self.context.get('expand', ())
+        fields = {
+            name: field for name, field in fields.items() if name in selected
+        }
+        for name, slug_field in self.collapsed_fields.items():
+            if name in fields and name not in expand:
+                fields[name] = serializers.SlugRelatedField(
+                    slug_field=slug_field,
+                    many=getattr(fields[name], 'many', False),
+                    read_only=True
+                )
+        return fields
+
+
+class CategorySerializer(MeasuredSerializerMixin, serializers.ModelSerializer):
 
     class Meta:
         exclude = ['id']
         model = Category
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(MeasuredSerializerMixin, serializers.ModelSerializer):
 
     class Meta:
         exclude = ['id']
         model = Genre
 
 
-class TitleGetSerializer(serializers.ModelSerializer):
+class CategoryBulkSerializer(CategorySerializer):
+    slug = serializers.SlugField(max_length=MAX_SLUG_CHAR)
+
+    class Meta(CategorySerializer.Meta):
+        list_serializer_class = SlugBulkListSerializer
+
+
+class GenreBulkSerializer(GenreSerializer):
+    slug = serializers.SlugField(max_length=MAX_SLUG_CHAR)
+
+    class Meta(GenreSerializer.Meta):
+        list_serializer_class = SlugBulkListSerializer
+
+
+class TitleStatsSerializer(serializers.ModelSerializer):
+    scores = serializers.DictField(
+        child=serializers.IntegerField(), read_only=True
+    )
+
+    class Meta:
+        fields = ('review_count', 'comment_count', 'scores', 'last_activity')
+        model = TitleStats
+
+
+class TitleGetSerializer(
+    MeasuredSerializerMixin, SparseFieldsSerializerMixin,
+    serializers.ModelSerializer
+):
+    collapsed_fields = {'genre': 'slug', 'category': 'slug'}
     genre = GenreSerializer(many=True,)
-    rating = serializers.FloatField(read_only=True)
     category = CategorySerializer()
+    stats = TitleStatsSerializer(read_only=True)
 
     class Meta:
-        fields = '__all__'
+        exclude = ('rating_sum', 'rating_count')
         read_only_fields = ('category', 'rating', 'genre')
         model = Title
 
 
-class TitlePostSerializer(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
+class TitlePostSerializer(
+    MeasuredSerializerMixin, serializers.ModelSerializer
+):
+    genre = SlugLookupField(
         many=True,
         queryset=Genre.objects.all(),
         slug_field='slug',
     )
-    category = serializers.SlugRelatedField(
+    category = SlugLookupField(
         queryset=Category.objects.all(),
         slug_field='slug',
     )
 
     class Meta:
-        fields = '__all__'
+        exclude = ('rating_sum', 'rating_count', 'rating')
+        list_serializer_class = BulkListSerializer
         model = Title
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(
+    MeasuredSerializerMixin, SparseFieldsSerializerMixin,
+    serializers.ModelSerializer
+):
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field='username'
@@ -66,21 +257,16 @@ class ReviewSerializer(serializers.ModelSerializer):
     score = serializers.IntegerField(
         validators=[
             MinValueValidator(
-                1, message='The score must be at least 1!'),
+                MIN_SCORE, message='The score must be at least 1!'),
             MaxValueValidator(
-                10, message='The score should not be higher than 10!')
+                MAX_SCORE, message='The score should not be higher than 10!')
         ]
     )
     title = serializers.PrimaryKeyRelatedField(read_only=True)
 
     def validate(self, value):
         author = self.context['request'].user
-        title_id = (self.context['request'].
-                    parser_context['kwargs'].get('title_id'))
-        title = get_object_or_404(
-            Title,
-            id=title_id
-        )
+        title = self.context['view'].title
         if (self.context['request'].method == 'POST'
                 and title.reviews.filter(author=author).exists()):
             raise serializers.ValidationError(
@@ -93,7 +279,10 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(
+    MeasuredSerializerMixin, SparseFieldsSerializerMixin,
+    serializers.ModelSerializer
+):
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field='username'
@@ -105,7 +294,9 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
 
 
-class UserRegistrationSerializer(serializers.ModelSerializer):
+class UserRegistrationSerializer(
+    MeasuredSerializerMixin, serializers.ModelSerializer
+):
     email = serializers.EmailField(
         max_length=MAX_STRING_CHAR,
         required=True
@@ -143,7 +334,9 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return data
 
 
-class AdminUserSerializer(serializers.ModelSerializer):
+class AdminUserSerializer(
+    MeasuredSerializerMixin, serializers.ModelSerializer
+):
     email = serializers.EmailField(
         max_length=MAX_STRING_CHAR,
         required=True,
@@ -202,12 +395,13 @@ class TokenSerializer(serializers.Serializer):
             raise exceptions.NotFound({'detail': 'User not found!'})
         if user.confirmation_code != confirmation_code:
             raise serializers.ValidationError({'token': 'Wrong access code!'})
-        token = confirmation_code_generator()
-        attrs['token'] = token
+        attrs.update(issue_tokens(user))
         return attrs
 
 
-class CustomUserSerializer(serializers.ModelSerializer):
+class CustomUserSerializer(
+    MeasuredSerializerMixin, serializers.ModelSerializer
+):
     username = serializers.CharField(
         max_length=MAX_LENGTH_FIRST_LAST_AND_USERNAME,
         validators=[username_validator]
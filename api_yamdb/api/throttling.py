@@ -0,0 +1,116 @@
+from abc import ABC, abstractmethod
+from hashlib import md5
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from api.cache import get_cache
+
+THROTTLE_KEY = 'api:throttle:{scope}:{digest}'
+
+
+class SlidingWindowThrottle(SimpleRateThrottle, ABC):
+    """Rate throttle on two counters in the API cache.
+
+    A request is weighed against the count of the current fixed window
+    plus the share of the previous window still inside the sliding one.
+    Unlike the request history of SimpleRateThrottle this costs one
+    get_many and one add or incr, whatever the rate.
+    """
+
+    def get_rate(self):
+        # Throttles are built per request: rates follow the settings.
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    @abstractmethod
+    def get_value(self, request, view):
+        """What requests are counted by, None to let a request through."""
+
+    def get_cache_key(self, request, view):
+        value = self.get_value(request, view)
+        if not value:
+            return None
+        # The endpoints do not share their budgets.
+        raw = f'{getattr(view, "action", None)}|{value}'
+        return THROTTLE_KEY.format(
+            scope=self.scope, digest=md5(raw.encode()).hexdigest()
+        )
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+        self.now = self.timer()
+        window, elapsed = divmod(self.now, self.duration)
+        self.key = f'{key}:{int(window)}'
+        previous_key = f'{key}:{int(window) - 1}'
+        cache = get_cache()
+        counts = cache.get_many([self.key, previous_key])
+        self.current = counts.get(self.key, 0)
+        self.previous = counts.get(previous_key, 0)
+        self.elapsed = elapsed
+        weight = 1 - elapsed / self.duration
+        if self.current + self.previous * weight >= self.num_requests:
+            return self.throttle_failure()
+        self.count_request(cache)
+        return self.throttle_success()
+
+    def count_request(self, cache):
+        timeout = 2 * self.duration
+        if cache.add(self.key, 1, timeout):
+            return
+        try:
+            cache.incr(self.key)
+        except ValueError:
+            # Expired between add() and incr().
+            cache.add(self.key, 1, timeout)
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """Seconds until the weighted count drops below the rate."""
+        remaining = self.duration - self.elapsed
+        if self.current >= self.num_requests:
+            # Wait for the next window and for enough of this one to
+            # slide out.
+            return remaining + self.duration * (
+                1 - self.num_requests / self.current
+            )
+        share = 1 - (self.num_requests - self.current) / self.previous
+        return max(self.duration * share - self.elapsed, 0)
+
+
+class IPAuthThrottle(SlidingWindowThrottle):
+    """Throttle per client address.
+
+    X-Forwarded-For is only read behind the NUM_PROXIES trusted proxies
+    of the REST_FRAMEWORK settings; with none, REMOTE_ADDR is used, so a
+    forged header does not open a new budget.
+    """
+
+    scope = 'auth_ip'
+
+    def get_value(self, request, view):
+        return self.get_ident(request)
+
+
+class UsernameAuthThrottle(SlidingWindowThrottle):
+    """Throttle per value of a request field, whoever sends it."""
+
+    scope = 'auth_username'
+    field = 'username'
+
+    def get_value(self, request, view):
+        data = request.data
+        value = data.get(self.field) if hasattr(data, 'get') else None
+        if not isinstance(value, str):
+            return None
+        return value.strip().lower()
+
+
+class EmailAuthThrottle(UsernameAuthThrottle):
+    scope = 'auth_email'
+    field = 'email'
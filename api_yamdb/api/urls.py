@@ -1,11 +1,14 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
+from rest_framework_simplejwt.views import TokenRefreshView
 
 from api.views import CustomUserViewSet
 from api.views import (
     CategoryViewSet,
     CommentViewSet,
+    ExportView,
     GenreViewSet,
+    MetricsView,
     ReviewViewSet,
     TitleViewSet
 )
@@ -45,6 +48,8 @@ router_v1.register(
 
 urls = [
     path('', include(router_v1.urls)),
+    path('export/<str:dataset>/', ExportView.as_view(), name='export'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ]
 
 auth_patterns = [
@@ -54,6 +59,7 @@ auth_patterns = [
     path('token/', CustomUserViewSet.as_view(
         {'post': 'token'}), name='token'
     ),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 ]
 
 urlpatterns = [
@@ -1,20 +1,23 @@
 from http import HTTPStatus
 
 import django_filters
-from django.db.models import Avg
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from django.contrib.auth import get_user_model
+from django.db.models import F, Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, permissions, viewsets
+from rest_framework import exceptions, filters, permissions, viewsets
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 
 import api.serializers as serializers
 import reviews.models as models
 from api.viewsets import ListCreateDeleteViewset
 from api.filters import TitleFilter
+from api.pagination import CountedPageNumberPagination, PubDatePagination
 from api.permissions import (
     IsAdminModeratorAuthorOrReadOnly, IsAdminUserOrReadOnly
 )
@@ -26,38 +29,127 @@ from api.serializers import (
 )
 from api.permissions import IsAdmin
 from api.filters import CustomUserFilter
-from api.mixins import SearchAndPermissionsMixin
+from api.cache import (
+    CATALOGUE_GROUP, CATEGORIES_GROUP, GENRES_GROUP, TITLES_GROUP,
+    comments_group, reviews_group, title_group
+)
+from api.middleware import get_counters, reset_counters
+from api.mixins import (
+    BulkWriteMixin, CachedListMixin, CachedResponseMixin, RowListMixin,
+    SearchAndPermissionsMixin, SparseFieldsMixin
+)
+from api.rows import (
+    CategoryRowSerializer, CommentRowSerializer, GenreRowSerializer,
+    ReviewRowSerializer, TitleRowSerializer
+)
+from api.throttling import (
+    EmailAuthThrottle, IPAuthThrottle, UsernameAuthThrottle
+)
+from reviews.exports import (
+    CONTENT_TYPES, CSV_FORMAT, EXPORT_FORMATS, EXPORT_SPEC, export_lines
+)
 from user.utils import customed_send_mail, confirmation_code_generator
 
 
 CustomUser = get_user_model()
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = models.Title.objects.annotate(
-        rating=Avg('reviews__score')).order_by('rating')
+def objects_by_slug(model, slugs):
+    return {
+        obj.slug: obj for obj in model.objects.filter(slug__in=set(slugs))
+    }
+
+
+class TitleViewSet(
+    BulkWriteMixin, SparseFieldsMixin, CachedResponseMixin, RowListMixin,
+    viewsets.ModelViewSet
+):
+    bulk_serializer_class = serializers.TitlePostSerializer
+    bulk_lookup_field = 'id'
+    bulk_cache_groups = (TITLES_GROUP, CATALOGUE_GROUP)
+    row_serializer_class = TitleRowSerializer
+    # Genres have no default ordering; the row serializer uses the same.
+    # The default order matches TieBreakOrderingFilter on `rating`.
+    queryset = models.Title.objects.select_related(
+        'category', 'stats'
+    ).prefetch_related(
+        Prefetch('genre', queryset=models.Genre.objects.order_by('pk'))
+    ).order_by(F('rating').asc(nulls_last=True), 'pk')
     http_method_names = ['get', 'post', 'patch', 'delete']
     permission_classes = [IsAdminUserOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_class = TitleFilter
 
+    def get_cache_groups(self):
+        if self.action == 'retrieve':
+            return (CATALOGUE_GROUP, title_group(self.kwargs['pk']))
+        return (TITLES_GROUP,)
+
+    def perform_bulk_save(self, serializer):
+        titles = serializer.save()
+        if self.request.method == 'POST':
+            # bulk_create skips the post_save receiver creating statistics.
+            models.TitleStats.objects.bulk_create(
+                [models.TitleStats(title=title) for title in titles],
+                ignore_conflicts=True
+            )
+
+    def get_slug_lookup(self, items):
+        items = [item for item in items if isinstance(item, dict)]
+        genres = [
+            slug for item in items
+            if isinstance(item.get('genre'), list)
+            for slug in item['genre'] if isinstance(slug, str)
+        ]
+        categories = [
+            item['category'] for item in items
+            if isinstance(item.get('category'), str)
+        ]
+        return {
+            models.Genre: objects_by_slug(models.Genre, genres),
+            models.Category: objects_by_slug(models.Category, categories),
+        }
+
     def get_serializer_class(self, *args, **kwargs):
         if self.request.method == 'GET':
             return serializers.TitleGetSerializer
         return serializers.TitlePostSerializer
 
 
-class GenreViewSet(SearchAndPermissionsMixin, ListCreateDeleteViewset):
+class GenreViewSet(
+    BulkWriteMixin, CachedListMixin, RowListMixin, SearchAndPermissionsMixin,
+    ListCreateDeleteViewset
+):
+    bulk_serializer_class = serializers.GenreBulkSerializer
+    bulk_cache_groups = (GENRES_GROUP, TITLES_GROUP, CATALOGUE_GROUP)
+    cache_groups = (GENRES_GROUP,)
+    row_serializer_class = GenreRowSerializer
     queryset = models.Genre.objects.all()
     serializer_class = serializers.GenreSerializer
 
 
-class CategoryViewSet(SearchAndPermissionsMixin, ListCreateDeleteViewset):
+class CategoryViewSet(
+    BulkWriteMixin, CachedListMixin, RowListMixin, SearchAndPermissionsMixin,
+    ListCreateDeleteViewset
+):
+    bulk_serializer_class = serializers.CategoryBulkSerializer
+    bulk_cache_groups = (CATEGORIES_GROUP, TITLES_GROUP, CATALOGUE_GROUP)
+    cache_groups = (CATEGORIES_GROUP,)
+    row_serializer_class = CategoryRowSerializer
     queryset = models.Category.objects.all()
     serializer_class = serializers.CategorySerializer
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    SparseFieldsMixin, CachedResponseMixin, RowListMixin,
+    viewsets.ModelViewSet
+):
+    store_responses = False
+    pagination_class = PubDatePagination
+    row_serializer_class = ReviewRowSerializer
+    # The related manager sets the title of every row and cursor pages
+    # read pub_date, so both stay loaded under `?fields=`.
+    sparse_columns = ('title', 'pub_date')
     serializer_class = serializers.ReviewSerializer
     http_method_names = ['get', 'post', 'patch', 'delete']
     permission_classes = (
@@ -65,20 +157,38 @@ class ReviewViewSet(viewsets.ModelViewSet):
         IsAdminModeratorAuthorOrReadOnly
     )
 
-    def get_queryset(self):
-        title = get_object_or_404(
-            models.Title, id=self.kwargs.get('title_id')
+    @cached_property
+    def title(self):
+        return get_object_or_404(
+            models.Title.objects.select_related('stats'),
+            id=self.kwargs.get('title_id')
         )
-        return title.reviews.all()
+
+    def get_cache_groups(self):
+        return (reviews_group(self.kwargs['title_id']),)
+
+    def get_page_count(self):
+        """Number of reviews from the title statistics."""
+        try:
+            return self.title.stats.review_count
+        except models.TitleStats.DoesNotExist:
+            return None
+
+    def get_queryset(self):
+        return self.title.reviews.select_related('author')
 
     def perform_create(self, serializer):
-        title = get_object_or_404(
-            models.Title, id=self.kwargs.get('title_id')
-        )
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=self.request.user, title=self.title)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    SparseFieldsMixin, CachedResponseMixin, RowListMixin,
+    viewsets.ModelViewSet
+):
+    store_responses = False
+    pagination_class = PubDatePagination
+    row_serializer_class = CommentRowSerializer
+    sparse_columns = ('review', 'pub_date')
     serializer_class = serializers.CommentSerializer
     http_method_names = ['get', 'post', 'patch', 'delete']
     permission_classes = (
@@ -86,23 +196,28 @@ class CommentViewSet(viewsets.ModelViewSet):
         IsAdminModeratorAuthorOrReadOnly
     )
 
-    def get_queryset(self):
-        review = get_object_or_404(
-            models.Review, id=self.kwargs.get('review_id')
+    @cached_property
+    def review(self):
+        return get_object_or_404(
+            models.Review,
+            id=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('title_id')
         )
-        return review.comments.all()
+
+    def get_cache_groups(self):
+        return (comments_group(self.kwargs['review_id']),)
+
+    def get_queryset(self):
+        return self.review.comments.select_related('author')
 
     def perform_create(self, serializer):
-        review = get_object_or_404(
-            models.Review, id=self.kwargs.get('review_id')
-        )
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.review)
 
 
 class CustomUserViewSet(viewsets.ModelViewSet):
     queryset = CustomUser.objects.all()
     serializer_class = CustomUserSerializer
-    pagination_class = PageNumberPagination
+    pagination_class = CountedPageNumberPagination
     permission_classes = (IsAdmin,)
     lookup_field = 'username'
     filter_backends = (
@@ -112,6 +227,9 @@ class CustomUserViewSet(viewsets.ModelViewSet):
     search_fields = ('username',)
     filterset_class = CustomUserFilter
     http_method_names = ['get', 'post', 'patch', 'delete']
+    auth_throttle_classes = (
+        IPAuthThrottle, UsernameAuthThrottle, EmailAuthThrottle
+    )
 
     def get_permissions(self):
         if self.action in ('signup', 'token'):
@@ -120,6 +238,11 @@ class CustomUserViewSet(viewsets.ModelViewSet):
             return [IsAuthenticated()]
         return [IsAdmin()]
 
+    def get_throttles(self):
+        if self.action in ('signup', 'token'):
+            return [throttle() for throttle in self.auth_throttle_classes]
+        return super().get_throttles()
+
     def get_serializer_class(self):
         if self.action == 'signup':
             return UserRegistrationSerializer
@@ -129,7 +252,8 @@ class CustomUserViewSet(viewsets.ModelViewSet):
 
     def get_object(self):
         if self.action == 'me':
-            return self.request.user
+            # request.user only carries the cached authentication snapshot.
+            return get_object_or_404(CustomUser, pk=self.request.user.pk)
         username = self.kwargs.get('username')
         return get_object_or_404(CustomUser, username=username)
 
@@ -142,16 +266,17 @@ class CustomUserViewSet(viewsets.ModelViewSet):
     def me(self, request):
         if request.method == 'DELETE':
             return Response(status=HTTPStatus.METHOD_NOT_ALLOWED)
+        user = self.get_object()
         if request.method == 'PATCH':
             serializer = self.get_serializer(
-                request.user,
+                user,
                 data=request.data,
                 partial=True
             )
             serializer.is_valid(raise_exception=True)
-            serializer.save(role=request.user.role)
+            serializer.save(role=user.role)
             return Response(serializer.data)
-        serializer = self.get_serializer(request.user)
+        serializer = self.get_serializer(user)
         return Response(serializer.data)
 
     @action(detail=False, methods=['post'])
@@ -176,7 +301,42 @@ class CustomUserViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         return Response(
             {
-                'token': str(serializer.validated_data['token'])
+                'token': serializer.validated_data['access'],
+                'refresh': serializer.validated_data['refresh']
             },
             status=HTTPStatus.OK
         )
+
+
+class ExportView(APIView):
+    permission_classes = (IsAdmin,)
+
+    def get(self, request, dataset):
+        if dataset not in EXPORT_SPEC:
+            raise exceptions.NotFound(f'Unknown dataset {dataset}.')
+        file_format = request.query_params.get('output', CSV_FORMAT)
+        if file_format not in EXPORT_FORMATS:
+            raise exceptions.ValidationError(
+                {'output': f'Choose one of: {", ".join(EXPORT_FORMATS)}.'}
+            )
+        response = StreamingHttpResponse(
+            export_lines(dataset, file_format),
+            content_type=CONTENT_TYPES[file_format]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{dataset}.{file_format}"'
+        )
+        return response
+
+
+class MetricsView(APIView):
+    """Request counters of this worker process per view and action."""
+
+    permission_classes = (IsAdmin,)
+
+    def get(self, request):
+        return Response(get_counters())
+
+    def delete(self, request):
+        reset_counters()
+        return Response(status=HTTPStatus.NO_CONTENT)
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -30,6 +31,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -63,14 +65,106 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 # Database
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE=postgresql switches from the bundled SQLite file to PostgreSQL.
+# Connections are kept open for DB_CONN_MAX_AGE seconds and checked before
+# reuse at the start of every request (DB_HEALTH_CHECKS). Behind PgBouncer
+# in transaction mode set DB_DISABLE_SERVER_SIDE_CURSORS=1.
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 60))
+DB_HEALTH_CHECKS = os.getenv('DB_HEALTH_CHECKS', '1') == '1'
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('POSTGRES_DB', 'yamdb'),
+            'USER': os.getenv('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'DISABLE_SERVER_SIDE_CURSORS': (
+                os.getenv('DB_DISABLE_SERVER_SIDE_CURSORS', '0') == '1'
+            ),
+            'OPTIONS': {
+                'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 5)),
+            },
+        }
     }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        }
+    }
+
+# Applied to every new SQLite connection: WAL lets readers run during a
+# write, NORMAL sync is safe with WAL, writers wait busy_timeout ms for the
+# lock instead of failing and reads go through a memory map.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
 }
 
 
+# Cache
+
+# Cached responses, their version keys, user snapshots and throttle
+# counters must be seen by every worker: CACHE_BACKEND=memcached shares
+# them through the servers in CACHE_LOCATION (comma separated). The
+# default per-process cache only suits a single worker; the api.W001
+# check warns about it.
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'memcached':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.getenv(
+                'CACHE_LOCATION', '127.0.0.1:11211'
+            ).split(','),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Cache used for API responses and how long they are kept, in seconds.
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = 60 * 5
+API_USER_CACHE_TIMEOUT = 60 * 5
+# Page totals are cached per filter for this many seconds; lists of the
+# cached groups also drop them on every change.
+API_COUNT_CACHE_TIMEOUT = 30
+
+
+# Request instrumentation
+
+# API_INSTRUMENTATION=1 collects per view/action query, DB, serialization
+# and render timings (served at /api/v1/metrics/); requests slower than
+# API_SLOW_REQUEST_MS milliseconds are logged to `api.requests`. It wraps
+# every query, so it is off by default. The Server-Timing header exposes
+# internals, so it follows DEBUG.
+API_INSTRUMENTATION = os.getenv('API_INSTRUMENTATION', '0') == '1'
+API_SLOW_REQUEST_MS = 500
+API_SERVER_TIMING = DEBUG
+
+
+# Opt-in: API_ROW_LISTS=1 renders list pages from values() rows instead of
+# model serializers; the output is the same (tests/test_26_row_lists.py).
+# With API_JSON_FRAGMENTS=1 the encoded titles, genres and categories are
+# also cached one by one and reused across pages.
+API_ROW_LISTS = os.getenv('API_ROW_LISTS', '0') == '1'
+API_JSON_FRAGMENTS = os.getenv('API_JSON_FRAGMENTS', '0') == '1'
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -112,16 +206,42 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_mails'
 
+# Signup mails are queued and sent by `manage.py send_queued_mail`; eager
+# mode sends them right away. Retries back off from MAIL_QUEUE_RETRY_DELAY
+# seconds, doubling after every failed attempt. A worker claims a batch
+# for MAIL_QUEUE_CLAIM_TIMEOUT seconds and sends it outside the claiming
+# transaction. Sent and failed mails carry confirmation codes, so the
+# worker deletes them MAIL_QUEUE_RETENTION seconds later.
+MAIL_QUEUE_EAGER = False
+MAIL_QUEUE_MAX_ATTEMPTS = 5
+MAIL_QUEUE_RETRY_DELAY = 60
+MAIL_QUEUE_CLAIM_TIMEOUT = 300
+MAIL_QUEUE_RETENTION = 24 * 60 * 60
+
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.CountedPageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
+    # Sliding window limits of signup and token requests per client IP,
+    # username and email (see api.throttling); None turns one off.
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': '20/min',
+        'auth_username': '5/min',
+        'auth_email': '5/min',
+    },
+    # Reverse proxies in front of the app that append to X-Forwarded-For.
+    # With 0 the client address is REMOTE_ADDR and the header is ignored.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
 }
 
 SIMPLE_JWT = {
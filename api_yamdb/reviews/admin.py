@@ -1,16 +1,48 @@
 from django.contrib import admin
+from django.db.models import Q
 
 from reviews.models import Title, Category, Genre, Review, Comment
+from reviews.paginators import EstimatedCountPaginator
+from user.models import CustomUser
+
+
+class AuthorTitleSearchMixin:
+    """Search by the exact author username or a title name prefix.
+
+    Both conditions are IN subqueries on indexed columns: ORed across
+    joined user and title tables they would scan every row. The prefix is
+    served by title_name_prefix_idx (see migration 0008).
+    """
+
+    search_fields = ('=author__username', '^title__name')
+
+    def title_condition(self, titles):
+        return Q(title__in=titles)
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        authors = CustomUser.objects.filter(username=search_term)
+        titles = Title.objects.filter(name__istartswith=search_term)
+        return queryset.filter(
+            Q(author__in=authors.values('pk'))
+            | self.title_condition(titles.values('pk'))
+        ), False
 
 
 @admin.register(Title)
 class TitleAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'year', 'category', 'get_genres')
     list_filter = ('year', 'category', 'genre')
+    list_select_related = ('category',)
     search_fields = ('name',)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('genre')
+
     def get_genres(self, obj):
-        return ", ".join(obj.genre.values_list("name", flat=True))
+        return ", ".join(genre.name for genre in obj.genre.all())
 
     get_genres.short_description = "Жанры"
 
@@ -28,14 +60,24 @@ class GenreAdmin(admin.ModelAdmin):
 
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(AuthorTitleSearchMixin, admin.ModelAdmin):
     list_display = ('id', 'title', 'author', 'score', 'pub_date')
     list_filter = ('score', 'pub_date')
-    search_fields = ('author__username', 'title__name')
+    list_select_related = ('title', 'author')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(AuthorTitleSearchMixin, admin.ModelAdmin):
     list_display = ('id', 'review', 'author', 'text', 'pub_date')
     list_filter = ('pub_date',)
-    search_fields = ('author__username', 'review__title__name')
+    list_select_related = ('review', 'author')
+    search_fields = ('=author__username', '^review__title__name')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def title_condition(self, titles):
+        return Q(review__in=Review.objects.filter(
+            title__in=titles
+        ).values('pk'))
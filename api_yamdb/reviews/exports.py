@@ -0,0 +1,101 @@
+import csv
+import json
+from datetime import datetime
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from user.models import CustomUser
+
+CSV_FORMAT = 'csv'
+NDJSON_FORMAT = 'ndjson'
+EXPORT_FORMATS = (CSV_FORMAT, NDJSON_FORMAT)
+CONTENT_TYPES = {
+    CSV_FORMAT: 'text/csv; charset=utf-8',
+    NDJSON_FORMAT: 'application/x-ndjson; charset=utf-8',
+}
+DEFAULT_CHUNK_SIZE = 2000
+
+# Dataset name -> model and (column, attribute) pairs mirroring static/data.
+EXPORT_SPEC = {
+    'users': (CustomUser, (
+        ('id', 'id'),
+        ('username', 'username'),
+        ('email', 'email'),
+        ('role', 'role'),
+        ('bio', 'bio'),
+        ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+    )),
+    'category': (Category, (
+        ('id', 'id'), ('name', 'name'), ('slug', 'slug'),
+    )),
+    'genre': (Genre, (
+        ('id', 'id'), ('name', 'name'), ('slug', 'slug'),
+    )),
+    'titles': (Title, (
+        ('id', 'id'),
+        ('name', 'name'),
+        ('year', 'year'),
+        ('category', 'category_id'),
+    )),
+    'genre_title': (Title.genre.through, (
+        ('id', 'id'), ('title_id', 'title_id'), ('genre_id', 'genre_id'),
+    )),
+    'review': (Review, (
+        ('id', 'id'),
+        ('title_id', 'title_id'),
+        ('text', 'text'),
+        ('author', 'author_id'),
+        ('score', 'score'),
+        ('pub_date', 'pub_date'),
+    )),
+    'comments': (Comment, (
+        ('id', 'id'),
+        ('review_id', 'review_id'),
+        ('text', 'text'),
+        ('author', 'author_id'),
+        ('pub_date', 'pub_date'),
+    )),
+}
+
+
+class Echo:
+    """File-like object handing written CSV lines back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def plain_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def export_columns(dataset):
+    _, columns = EXPORT_SPEC[dataset]
+    return [column for column, _ in columns]
+
+
+def export_rows(dataset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield value tuples of a dataset without loading it into memory."""
+    model, columns = EXPORT_SPEC[dataset]
+    rows = model.objects.order_by('pk').values_list(
+        *(attribute for _, attribute in columns)
+    ).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield tuple(plain_value(value) for value in row)
+
+
+def export_lines(dataset, file_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield a dataset as CSV or NDJSON text lines, header first."""
+    columns = export_columns(dataset)
+    rows = export_rows(dataset, chunk_size)
+    if file_format == NDJSON_FORMAT:
+        for row in rows:
+            record = dict(zip(columns, row))
+            yield json.dumps(record, ensure_ascii=False) + '\n'
+        return
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
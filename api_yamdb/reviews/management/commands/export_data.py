@@ -0,0 +1,50 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from reviews.exports import (
+    CSV_FORMAT, DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, EXPORT_SPEC, export_lines
+)
+
+
+class Command(BaseCommand):
+    help = 'Export YaMDb data in the static/data CSV layout or as NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'datasets',
+            nargs='*',
+            choices=list(EXPORT_SPEC),
+            help='Datasets to export, all of them by default.'
+        )
+        parser.add_argument(
+            '--path',
+            default=Path('.'),
+            type=Path,
+            help='Directory the files are written to.'
+        )
+        parser.add_argument(
+            '--format',
+            default=CSV_FORMAT,
+            choices=EXPORT_FORMATS,
+            dest='file_format'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            default=DEFAULT_CHUNK_SIZE,
+            type=int,
+            help='Number of rows fetched from the database at once.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        path.mkdir(parents=True, exist_ok=True)
+        file_format = options['file_format']
+        for dataset in options['datasets'] or EXPORT_SPEC:
+            file_path = path / f'{dataset}.{file_format}'
+            with open(file_path, 'w', encoding='utf-8', newline='') as file:
+                file.writelines(export_lines(
+                    dataset, file_format, options['chunk_size']
+                ))
+            self.stdout.write(f'{dataset} exported to {file_path}.')
+        self.stdout.write(self.style.SUCCESS('Export finished.'))
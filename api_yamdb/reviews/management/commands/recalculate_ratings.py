@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from reviews.models import Comment, Review, Title, TitleStats
+from reviews.signals import rating_changed, stats_changed
+from reviews.stats import rebuild_title_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild stored rating counters and statistics of all titles from '
+        'reviews and comments.'
+    )
+
+    def handle(self, *args, **options):
+        scores = Review.objects.filter(
+            title=OuterRef('pk'), score__isnull=False
+        ).order_by().values('title')
+        with transaction.atomic():
+            updated = Title.objects.update(
+                rating_sum=Coalesce(
+                    Subquery(scores.annotate(total=Sum('score'))
+                             .values('total')), 0
+                ),
+                rating_count=Coalesce(
+                    Subquery(scores.annotate(total=Count('pk'))
+                             .values('total')), 0
+                ),
+                rating=Subquery(
+                    scores.annotate(average=Avg('score')).values('average')
+                ),
+            )
+            rebuild_title_stats(Title, TitleStats, Review, Comment)
+        rating_changed.send(sender=Title, title_id=None)
+        stats_changed.send(sender=TitleStats, title_id=None)
+        self.stdout.write(
+            self.style.SUCCESS(f'Ratings recalculated for {updated} titles.')
+        )
@@ -0,0 +1,156 @@
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from reviews.management.commands.import_csv import (
+    DEFAULT_BATCH_SIZE, keep_pub_date, reset_sequences
+)
+from reviews.models import Category, Comment, Genre, Review, Title
+from user.models import CustomUser
+
+GENRES_PER_TITLE = 2
+TEXT = (
+    'Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do '
+    'eiusmod tempor incididunt ut labore et dolore magna aliqua. '
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill the database with a synthetic dataset of the given size, '
+        'e.g. for benchmark_api.'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in (
+            ('categories', 10),
+            ('genres', 20),
+            ('titles', 10_000),
+            ('users', 1_000),
+            ('reviews', 1_000_000),
+            ('comments', 5_000_000),
+        ):
+            parser.add_argument(
+                f'--{name}',
+                default=default,
+                type=int,
+                help=f'Number of {name} to create (default {default}).'
+            )
+        parser.add_argument(
+            '--batch-size',
+            default=DEFAULT_BATCH_SIZE,
+            type=int,
+            help='Number of rows inserted per bulk_create call.'
+        )
+
+    def handle(self, *args, **options):
+        if min(options[name] for name in (
+            'categories', 'genres', 'titles', 'users', 'batch_size'
+        )) < 1 or min(options['reviews'], options['comments']) < 0:
+            raise CommandError('Dataset sizes must be positive numbers.')
+        if options['comments'] and not options['reviews']:
+            raise CommandError('Comments need at least one review.')
+        # Every user reviews a title at most once.
+        users = max(
+            options['users'], -(-options['reviews'] // options['titles'])
+        )
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.first_ids = {}
+        self.counts = {}
+        self.seed(CustomUser, users, self.build_user)
+        self.seed(Category, options['categories'], self.build_category)
+        self.seed(Genre, options['genres'], self.build_genre)
+        self.seed(Title, options['titles'], self.build_title)
+        self.seed(
+            Title.genre.through,
+            options['titles'] * min(GENRES_PER_TITLE, options['genres']),
+            self.build_title_genre
+        )
+        self.seed(Review, options['reviews'], self.build_review)
+        self.seed(Comment, options['comments'], self.build_comment)
+        reset_sequences([
+            CustomUser, Category, Genre, Title, Title.genre.through,
+            Review, Comment
+        ])
+        call_command('recalculate_ratings', stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS('Seeding finished.'))
+
+    def seed(self, model, count, build):
+        # Explicit ids let the following models reference the new rows on
+        # databases where bulk_create does not return primary keys.
+        first_id = (
+            model.objects.aggregate(last=Max('pk'))['last'] or 0
+        ) + 1
+        self.first_ids[model] = first_id
+        self.counts[model] = count
+        rows = (build(first_id + idx, idx) for idx in range(count))
+        with transaction.atomic(), keep_pub_date(model):
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+        self.stdout.write(f'{model._meta.db_table}: {count} rows created.')
+
+    def related_id(self, model, idx):
+        return self.first_ids[model] + idx % self.counts[model]
+
+    def build_user(self, pk, idx):
+        return CustomUser(
+            id=pk,
+            username=f'seed_user_{pk}',
+            email=f'seed_user_{pk}@yamdb.fake',
+            password=make_password(None),
+        )
+
+    def build_category(self, pk, idx):
+        return Category(
+            id=pk, name=f'Category {pk}', slug=f'seed-category-{pk}'
+        )
+
+    def build_genre(self, pk, idx):
+        return Genre(id=pk, name=f'Genre {pk}', slug=f'seed-genre-{pk}')
+
+    def build_title(self, pk, idx):
+        return Title(
+            id=pk,
+            name=f'Title {pk}',
+            year=1900 + idx % 120,
+            description=TEXT,
+            category_id=self.related_id(Category, idx),
+        )
+
+    def build_title_genre(self, pk, idx):
+        titles = self.counts[Title]
+        return Title.genre.through(
+            id=pk,
+            title_id=self.related_id(Title, idx),
+            genre_id=self.related_id(Genre, idx // titles + idx % titles),
+        )
+
+    def build_review(self, pk, idx):
+        titles = self.counts[Title]
+        return Review(
+            id=pk,
+            title_id=self.related_id(Title, idx),
+            author_id=self.first_ids[CustomUser] + idx // titles,
+            text=TEXT,
+            score=idx * 7 % 10 + 1,
+            pub_date=self.now - timedelta(seconds=idx),
+        )
+
+    def build_comment(self, pk, idx):
+        return Comment(
+            id=pk,
+            review_id=self.related_id(Review, idx),
+            author_id=self.related_id(CustomUser, idx),
+            text=TEXT,
+            pub_date=self.now - timedelta(seconds=idx),
+        )
@@ -0,0 +1,50 @@
+# Generated by Django 3.2 on 2026-10-18 20:58
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_title_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    scores = Review.objects.filter(
+        title=OuterRef('pk'), score__isnull=False
+    ).order_by().values('title')
+    Title.objects.update(
+        rating_sum=Coalesce(
+            Subquery(scores.annotate(total=Sum('score')).values('total')), 0
+        ),
+        rating_count=Coalesce(
+            Subquery(scores.annotate(total=Count('pk')).values('total')), 0
+        ),
+        rating=Subquery(
+            scores.annotate(average=Avg('score')).values('average')
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_title_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,75 @@
+from django.db import migrations
+
+FTS_TABLE = 'reviews_title_fts'
+PG_INDEX = 'reviews_title_search_gin'
+PG_DOCUMENT = (
+    "to_tsvector('simple'::regconfig, "
+    "COALESCE(name, '') || ' ' || COALESCE(description, ''))"
+)
+SQLITE_CREATE = (
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        name, description, content='reviews_title', content_rowid='id'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON reviews_title BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON reviews_title BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE OF name, description
+    ON reviews_title BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+)
+SQLITE_DROP = (
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_update',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for statement in SQLITE_CREATE:
+            schema_editor.execute(statement)
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX {PG_INDEX} ON reviews_title '
+            f'USING GIN ({PG_DOCUMENT})'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for statement in SQLITE_DROP:
+            schema_editor.execute(statement)
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {PG_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_rating'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
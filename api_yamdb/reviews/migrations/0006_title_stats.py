@@ -0,0 +1,92 @@
+# Generated by Django 3.2 on 2026-10-18 21:35
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+import django.db.models.deletion
+
+# Kept here rather than imported from reviews.stats, so the migration does
+# not change with the application code.
+SCORES = range(1, 11)
+
+
+def fill_title_stats(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleStats = apps.get_model('reviews', 'TitleStats')
+    Review = apps.get_model('reviews', 'Review')
+    Comment = apps.get_model('reviews', 'Comment')
+
+    def count_of(queryset, **filters):
+        return Coalesce(Subquery(
+            queryset.filter(**filters).annotate(total=Count('pk'))
+            .values('total')
+        ), 0)
+
+    def latest_of(queryset):
+        return Subquery(
+            queryset.annotate(last=Max('pub_date')).values('last')
+        )
+
+    TitleStats.objects.bulk_create(
+        (
+            TitleStats(title_id=title_id)
+            for title_id in Title.objects.values_list(
+                'pk', flat=True
+            ).iterator()
+        ),
+        batch_size=1000
+    )
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    comments = Comment.objects.filter(
+        review__title=OuterRef('pk')
+    ).order_by().values('review__title')
+    last_review, last_comment = latest_of(reviews), latest_of(comments)
+    TitleStats.objects.update(
+        review_count=count_of(reviews),
+        comment_count=count_of(comments),
+        # GREATEST is NULL on SQLite as soon as one side is NULL.
+        last_activity=Greatest(
+            Coalesce(last_review, last_comment),
+            Coalesce(last_comment, last_review)
+        ),
+        **{
+            f'score_{score}': count_of(reviews, score=score)
+            for score in SCORES
+        }
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleStats',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Количество комментариев')),
+                ('score_1', models.PositiveIntegerField(default=0, verbose_name='Оценок 1')),
+                ('score_2', models.PositiveIntegerField(default=0, verbose_name='Оценок 2')),
+                ('score_3', models.PositiveIntegerField(default=0, verbose_name='Оценок 3')),
+                ('score_4', models.PositiveIntegerField(default=0, verbose_name='Оценок 4')),
+                ('score_5', models.PositiveIntegerField(default=0, verbose_name='Оценок 5')),
+                ('score_6', models.PositiveIntegerField(default=0, verbose_name='Оценок 6')),
+                ('score_7', models.PositiveIntegerField(default=0, verbose_name='Оценок 7')),
+                ('score_8', models.PositiveIntegerField(default=0, verbose_name='Оценок 8')),
+                ('score_9', models.PositiveIntegerField(default=0, verbose_name='Оценок 9')),
+                ('score_10', models.PositiveIntegerField(default=0, verbose_name='Оценок 10')),
+                ('last_activity', models.DateTimeField(null=True, verbose_name='Последняя активность')),
+            ],
+            options={
+                'verbose_name': 'Статистика произведения',
+                'verbose_name_plural': 'Статистика произведений',
+            },
+        ),
+        migrations.RunPython(fill_title_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2 on 2026-10-18 21:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year'], name='title_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating'], name='title_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titlestats',
+            index=models.Index(fields=['review_count', 'title'], name='title_stats_reviews_idx'),
+        ),
+    ]
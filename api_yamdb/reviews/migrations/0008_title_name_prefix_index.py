@@ -0,0 +1,36 @@
+from django.db import migrations
+
+PREFIX_INDEX = 'title_name_prefix_idx'
+# Indexes serving name__istartswith: SQLite compares LIKE patterns with
+# NOCASE, PostgreSQL runs UPPER(name::text) LIKE UPPER(pattern).
+CREATE_SQL = {
+    'sqlite': (
+        f'CREATE INDEX {PREFIX_INDEX} ON reviews_title (name COLLATE NOCASE)'
+    ),
+    'postgresql': (
+        f'CREATE INDEX {PREFIX_INDEX} ON reviews_title '
+        '(UPPER(name::text) text_pattern_ops)'
+    ),
+}
+
+
+def create_prefix_index(apps, schema_editor):
+    statement = CREATE_SQL.get(schema_editor.connection.vendor)
+    if statement:
+        schema_editor.execute(statement)
+
+
+def drop_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE_SQL:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {PREFIX_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_range_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
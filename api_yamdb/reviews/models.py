@@ -1,6 +1,8 @@
-from django.db import models
+from django.db import models, router, transaction
 
-from api.constants import MAX_SLUG_CHAR, MAX_STRING_CHAR, MAX_STR_LENGTH
+from api.constants import (
+    MAX_SCORE, MAX_SLUG_CHAR, MAX_STRING_CHAR, MAX_STR_LENGTH, MIN_SCORE
+)
 from reviews.validators import validate_year
 from user.models import CustomUser
 
@@ -69,15 +71,51 @@ class Title(models.Model):
         null=True,
         blank=True,
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False
+    )
+    rating = models.FloatField(
+        verbose_name='Рейтинг',
+        null=True,
+        editable=False
+    )
+
+    RATING_FIELDS = ('rating_sum', 'rating_count', 'rating')
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ['name']
+        indexes = [
+            models.Index(
+                fields=['category', 'year'], name='title_category_year_idx'
+            ),
+            models.Index(fields=['name'], name='title_name_idx'),
+            models.Index(fields=['year'], name='title_year_idx'),
+            models.Index(fields=['rating'], name='title_rating_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Rating counters are shifted by review signals with UPDATE queries,
+        # so a full save of an already loaded title must not overwrite them.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
 
 class BaseReviewCommentModel(models.Model):
     author = models.ForeignKey(
@@ -96,6 +134,15 @@ class BaseReviewCommentModel(models.Model):
     class Meta:
         abstract = True
 
+    def save(self, *args, **kwargs):
+        # post_save receivers shift the stored counters of the title, so
+        # the row and the counters are committed together.
+        using = kwargs.get('using') or router.db_for_write(
+            type(self), instance=self
+        )
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
 
 class Review(BaseReviewCommentModel):
     title = models.ForeignKey(
@@ -113,6 +160,18 @@ class Review(BaseReviewCommentModel):
         ordering = ['pub_date']
         verbose_name = 'Обзор'
         verbose_name_plural = 'Обзоры'
+        # Reviews are listed per title and per author in pub_date order
+        # (id breaks ties for cursor pages).
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', 'pub_date'],
+                name='review_author_pub_date_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['author', 'title'], name='unique_review'
@@ -122,6 +181,14 @@ class Review(BaseReviewCommentModel):
     def __str__(self):
         return self.text[:MAX_STR_LENGTH]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored score so that rating counters of the title
+        # can be adjusted by a delta when the review is edited.
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
 
 class Comment(BaseReviewCommentModel):
     review = models.ForeignKey(
@@ -135,6 +202,76 @@ class Comment(BaseReviewCommentModel):
         ordering = ['pub_date']
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', 'pub_date'],
+                name='comment_author_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:MAX_STR_LENGTH]
+
+
+class TitleStats(models.Model):
+    """Review and comment counters of a title kept up to date by signals."""
+
+    SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Произведение'
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов', default=0
+    )
+    comment_count = models.PositiveIntegerField(
+        verbose_name='Количество комментариев', default=0
+    )
+    score_1 = models.PositiveIntegerField(verbose_name='Оценок 1', default=0)
+    score_2 = models.PositiveIntegerField(verbose_name='Оценок 2', default=0)
+    score_3 = models.PositiveIntegerField(verbose_name='Оценок 3', default=0)
+    score_4 = models.PositiveIntegerField(verbose_name='Оценок 4', default=0)
+    score_5 = models.PositiveIntegerField(verbose_name='Оценок 5', default=0)
+    score_6 = models.PositiveIntegerField(verbose_name='Оценок 6', default=0)
+    score_7 = models.PositiveIntegerField(verbose_name='Оценок 7', default=0)
+    score_8 = models.PositiveIntegerField(verbose_name='Оценок 8', default=0)
+    score_9 = models.PositiveIntegerField(verbose_name='Оценок 9', default=0)
+    score_10 = models.PositiveIntegerField(
+        verbose_name='Оценок 10', default=0
+    )
+    last_activity = models.DateTimeField(
+        verbose_name='Последняя активность', null=True
+    )
+
+    class Meta:
+        verbose_name = 'Статистика произведения'
+        verbose_name_plural = 'Статистика произведений'
+        indexes = [
+            models.Index(
+                fields=['review_count', 'title'],
+                name='title_stats_reviews_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return str(self.title_id)
+
+    @staticmethod
+    def score_field(score):
+        return f'score_{score}'
+
+    @property
+    def scores(self):
+        """Number of reviews per score, from MIN_SCORE to MAX_SCORE."""
+        return {
+            score: getattr(self, self.score_field(score))
+            for score in self.SCORES
+        }
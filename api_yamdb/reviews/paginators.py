@@ -0,0 +1,30 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+ESTIMATED_COUNT_THRESHOLD = 100_000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator taking the size of big unfiltered tables from statistics.
+
+    On PostgreSQL an unfiltered queryset is counted with pg_class.reltuples
+    once the table is larger than ESTIMATED_COUNT_THRESHOLD rows; filtered
+    querysets, small tables and other databases get an exact COUNT(*).
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class '
+                    'WHERE relname = %s',
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            if row and row[0] > ESTIMATED_COUNT_THRESHOLD:
+                return row[0]
+        return super().count
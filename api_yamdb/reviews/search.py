@@ -0,0 +1,68 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'reviews_title_fts'
+PG_DOCUMENT = (
+    "to_tsvector('simple'::regconfig, "
+    "COALESCE(reviews_title.name, '') || ' ' || "
+    "COALESCE(reviews_title.description, ''))"
+)
+WORD_RE = re.compile(r'\w+')
+
+_fts_available = {}
+
+
+def search_terms(query):
+    return WORD_RE.findall(query.lower())
+
+
+def has_fts_table(connection):
+    if connection.alias not in _fts_available:
+        _fts_available[connection.alias] = (
+            FTS_TABLE in connection.introspection.table_names()
+        )
+    return _fts_available[connection.alias]
+
+
+def search_titles(queryset, query):
+    """Filter titles by name and description, best matches first.
+
+    Every word is matched as a prefix. SQLite uses the FTS5 table and
+    PostgreSQL the GIN expression index created by migration 0004; other
+    databases fall back to icontains.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        return queryset.filter(RawSQL(
+            f"{PG_DOCUMENT} @@ to_tsquery('simple', %s)",
+            [tsquery],
+            output_field=BooleanField()
+        )).annotate(search_rank=RawSQL(
+            f"ts_rank({PG_DOCUMENT}, to_tsquery('simple', %s))",
+            [tsquery],
+            output_field=FloatField()
+        )).order_by('-search_rank', 'id')
+    if connection.vendor == 'sqlite' and has_fts_table(connection):
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [match]
+        )).annotate(search_rank=RawSQL(
+            f'SELECT bm25({FTS_TABLE}) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = reviews_title.id',
+            [match],
+            output_field=FloatField()
+        )).order_by('search_rank', 'id')
+    condition = Q()
+    for term in terms:
+        condition &= (
+            Q(name__icontains=term) | Q(description__icontains=term)
+        )
+    return queryset.filter(condition)
@@ -0,0 +1,172 @@
+import threading
+from collections import Counter
+
+from django.db.models import Case, ExpressionWrapper, F, FloatField, When
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from reviews.models import Comment, Review, Title, TitleStats
+
+# Sent with title_id after stored rating counters of a title change and with
+# title_id=None after the ratings of all titles are rebuilt.
+rating_changed = Signal()
+# The same for the review and comment counters kept in TitleStats.
+stats_changed = Signal()
+
+# Reviews and titles whose deletion is in progress in this thread. Django
+# sends pre_delete for every collected object before any post_delete, so
+# cascaded reviews and comments can leave the counters to their parent:
+# review id -> [title id, number of deleted comments], title ids.
+_deleting = threading.local()
+
+
+def deleting_reviews():
+    if not hasattr(_deleting, 'reviews'):
+        _deleting.reviews = {}
+    return _deleting.reviews
+
+
+def deleting_titles():
+    if not hasattr(_deleting, 'titles'):
+        _deleting.titles = set()
+    return _deleting.titles
+
+
+def review_deleting(review_id):
+    """Whether the review is being deleted together with its comments."""
+    return review_id in deleting_reviews()
+
+
+def score_weight(score):
+    """Return the (sum, count) contribution of a single score."""
+    if score is None:
+        return 0, 0
+    return int(score), 1
+
+
+def update_title_rating(title_id, sum_delta, count_delta):
+    """Shift stored rating counters of a title in a single UPDATE."""
+    if not sum_delta and not count_delta:
+        return
+    new_sum = F('rating_sum') + sum_delta
+    new_count = F('rating_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        rating=Case(
+            When(
+                rating_count__gt=-count_delta,
+                then=ExpressionWrapper(
+                    new_sum * 1.0 / new_count, output_field=FloatField()
+                )
+            ),
+            default=None,
+            output_field=FloatField()
+        )
+    )
+    rating_changed.send(sender=Title, title_id=title_id)
+
+
+def update_title_stats(title_id, reviews=0, comments=0, scores=None,
+                       touch=False):
+    """Shift TitleStats counters of a title in a single UPDATE.
+
+    `scores` maps a score to the change of its histogram bucket; `touch`
+    moves last_activity to now.
+    """
+    changes = {}
+    if reviews:
+        changes['review_count'] = F('review_count') + reviews
+    if comments:
+        changes['comment_count'] = F('comment_count') + comments
+    for score, delta in (scores or {}).items():
+        if delta and score in TitleStats.SCORES:
+            field = TitleStats.score_field(score)
+            changes[field] = F(field) + delta
+    if touch:
+        changes['last_activity'] = timezone.now()
+    if title_id is None or not changes:
+        return
+    TitleStats.objects.filter(title_id=title_id).update(**changes)
+    stats_changed.send(sender=TitleStats, title_id=title_id)
+
+
+def comment_title_id(comment):
+    if Comment.review.is_cached(comment):
+        return comment.review.title_id
+    return Review.objects.filter(pk=comment.review_id).values_list(
+        'title_id', flat=True
+    ).first()
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        TitleStats.objects.create(title=instance)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    new_sum, new_count = score_weight(instance.score)
+    scores = Counter({instance.score: 1})
+    if created:
+        old_sum, old_count = 0, 0
+    else:
+        old_score = getattr(instance, '_loaded_score', instance.score)
+        old_sum, old_count = score_weight(old_score)
+        scores[old_score] -= 1
+    update_title_rating(
+        instance.title_id, new_sum - old_sum, new_count - old_count
+    )
+    update_title_stats(
+        instance.title_id, reviews=int(created), scores=scores, touch=True
+    )
+    instance._loaded_score = instance.score
+
+
+@receiver(pre_delete, sender=Title)
+def title_deleting(sender, instance, **kwargs):
+    deleting_titles().add(instance.pk)
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    deleting_titles().discard(instance.pk)
+
+
+@receiver(pre_delete, sender=Review)
+def review_deleting_started(sender, instance, **kwargs):
+    deleting_reviews()[instance.pk] = [instance.title_id, 0]
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    _, comments = deleting_reviews().pop(instance.pk, (None, 0))
+    if instance.title_id in deleting_titles():
+        # The counters go away with the title.
+        return
+    old_score = getattr(instance, '_loaded_score', instance.score)
+    old_sum, old_count = score_weight(old_score)
+    update_title_rating(instance.title_id, -old_sum, -old_count)
+    update_title_stats(
+        instance.title_id, reviews=-1, comments=-comments,
+        scores={old_score: -1}
+    )
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    update_title_stats(
+        comment_title_id(instance), comments=int(created), touch=True
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    deleting = deleting_reviews().get(instance.review_id)
+    if deleting is not None:
+        # Counted by the review in one UPDATE.
+        deleting[1] += 1
+        return
+    update_title_stats(comment_title_id(instance), comments=-1)
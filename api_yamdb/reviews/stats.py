@@ -0,0 +1,54 @@
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from api.constants import MAX_SCORE, MIN_SCORE
+
+BATCH_SIZE = 1000
+
+
+def count_of(queryset, **filters):
+    return Coalesce(Subquery(
+        queryset.filter(**filters).annotate(total=Count('pk'))
+        .values('total')
+    ), 0)
+
+
+def latest_of(queryset):
+    return Subquery(
+        queryset.annotate(last=Max('pub_date')).values('last')
+    )
+
+
+def rebuild_title_stats(title_model, stats_model, review_model,
+                        comment_model):
+    """Recount TitleStats of every title with correlated subqueries."""
+    # Titles created with bulk_create have no statistics row yet.
+    stats_model.objects.bulk_create(
+        (
+            stats_model(title_id=title_id)
+            for title_id in title_model.objects.filter(
+                stats__isnull=True
+            ).values_list('pk', flat=True).iterator()
+        ),
+        batch_size=BATCH_SIZE
+    )
+    reviews = review_model.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    comments = comment_model.objects.filter(
+        review__title=OuterRef('pk')
+    ).order_by().values('review__title')
+    last_review, last_comment = latest_of(reviews), latest_of(comments)
+    return stats_model.objects.update(
+        review_count=count_of(reviews),
+        comment_count=count_of(comments),
+        # GREATEST is NULL on SQLite as soon as one side is NULL.
+        last_activity=Greatest(
+            Coalesce(last_review, last_comment),
+            Coalesce(last_comment, last_review)
+        ),
+        **{
+            f'score_{score}': count_of(reviews, score=score)
+            for score in range(MIN_SCORE, MAX_SCORE + 1)
+        }
+    )
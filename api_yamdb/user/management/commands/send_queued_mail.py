@@ -0,0 +1,70 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from user.utils import mail_queue_stats, purge_mail_queue, send_queued_mail
+
+# Seconds between purges of a running worker.
+PURGE_INTERVAL = 60 * 60
+
+
+class Command(BaseCommand):
+    help = 'Send mails from the outgoing mail queue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            default=100,
+            type=int,
+            help='Number of mails sent over one connection.'
+        )
+        parser.add_argument(
+            '--interval',
+            default=5,
+            type=float,
+            help='Seconds to wait when the queue has nothing due.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Send everything that is due and exit.'
+        )
+        parser.add_argument(
+            '--purge-older-than',
+            default=None,
+            type=int,
+            help=(
+                'Delete sent and failed mails older than this many seconds '
+                '(MAIL_QUEUE_RETENTION by default).'
+            )
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Print queue depth and exit.'
+        )
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            for name, value in mail_queue_stats().items():
+                self.stdout.write(f'{name}: {value}')
+            return
+        older_than = options['purge_older_than']
+        if older_than is None:
+            older_than = settings.MAIL_QUEUE_RETENTION
+        purged_at = None
+        while True:
+            processed = send_queued_mail(options['batch_size'])
+            if processed:
+                self.stdout.write(f'{processed} mails processed.')
+                continue
+            if (purged_at is None
+                    or time.monotonic() - purged_at >= PURGE_INTERVAL):
+                purged = purge_mail_queue(older_than)
+                purged_at = time.monotonic()
+                if purged:
+                    self.stdout.write(f'{purged} old mails deleted.')
+            if options['once']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,33 @@
+# Generated by Django 3.2 on 2026-10-18 21:10
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedMail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=254, verbose_name='Тема')),
+                ('body', models.TextField(verbose_name='Текст')),
+                ('recipient', models.EmailField(max_length=254, verbose_name='Получатель')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попытки отправки')),
+                ('next_attempt_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, null=True, verbose_name='Следующая попытка')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата отправки')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+            ],
+            options={
+                'verbose_name': 'Письмо в очереди',
+                'verbose_name_plural': 'Очередь писем',
+                'ordering': ('next_attempt_at', 'id'),
+            },
+        ),
+    ]
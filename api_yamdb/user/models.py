@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 from api.constants import (
     MAX_LENGTH_FIRST_LAST_AND_USERNAME,
@@ -39,6 +40,14 @@ class CustomUser(AbstractUser):
         verbose_name_plural = 'Пользователи'
         ordering = ('username',)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored username: cached reviews and comments show it
+        # and have to be dropped when it changes.
+        instance._loaded_username = instance.__dict__.get('username')
+        return instance
+
     @property
     def is_admin(self):
         return self.role == ROLE_ADMIN or self.is_superuser
@@ -46,3 +55,46 @@ class CustomUser(AbstractUser):
     @property
     def is_moderator(self):
         return self.role == ROLE_MODERATOR
+
+
+class QueuedMail(models.Model):
+    subject = models.CharField(
+        verbose_name='Тема',
+        max_length=MAX_STRING_CHAR
+    )
+    body = models.TextField(verbose_name='Текст')
+    recipient = models.EmailField(
+        verbose_name='Получатель',
+        max_length=MAX_STRING_CHAR
+    )
+    created_at = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попытки отправки',
+        default=0
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Следующая попытка',
+        default=timezone.now,
+        null=True,
+        db_index=True
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Дата отправки',
+        null=True,
+        blank=True
+    )
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ('next_attempt_at', 'id')
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
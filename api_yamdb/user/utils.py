@@ -1,19 +1,145 @@
 import re
 import secrets
 import string
+from contextlib import suppress
+from datetime import timedelta
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
 from rest_framework import serializers
 
+from user.models import QueuedMail
+
 
 def customed_send_mail(email, confirmation_code):
-    send_mail(
-        'Your confirmation code',
-        f'Your confirmation code: {confirmation_code}',
+    """Queue the confirmation code mail instead of sending it in-request."""
+    queued = QueuedMail.objects.create(
+        subject='Your confirmation code',
+        body=f'Your confirmation code: {confirmation_code}',
+        recipient=email,
+    )
+    if settings.MAIL_QUEUE_EAGER:
+        deliver_mail([queued])
+
+
+def deliver_mail(queued_mails):
+    """Send queued mails over one connection and record every outcome.
+
+    A connection that cannot be opened counts as a failed attempt for
+    every mail of the batch.
+    """
+    now = timezone.now()
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        for queued in queued_mails:
+            mark_failed(queued, now, error)
+    else:
+        try:
+            for queued in queued_mails:
+                send_one(connection, queued, now)
+        finally:
+            # The outcomes are known already: a failing QUIT changes none.
+            with suppress(Exception):
+                connection.close()
+    QueuedMail.objects.bulk_update(
+        queued_mails,
+        ('attempts', 'sent_at', 'next_attempt_at', 'last_error')
+    )
+
+
+def send_one(connection, queued, now):
+    message = EmailMessage(
+        queued.subject,
+        queued.body,
         settings.DEFAULT_FROM_EMAIL,
-        [email],
-        fail_silently=False,
+        [queued.recipient],
+        connection=connection,
+    )
+    try:
+        connection.send_messages([message])
+    except Exception as error:
+        mark_failed(queued, now, error)
+    else:
+        queued.attempts += 1
+        queued.sent_at = now
+        queued.next_attempt_at = None
+        queued.last_error = ''
+
+
+def mark_failed(queued, now, error):
+    queued.attempts += 1
+    queued.last_error = str(error)
+    queued.next_attempt_at = retry_time(now, queued.attempts)
+
+
+def retry_time(now, attempts):
+    """Exponential backoff; None once the attempts are exhausted."""
+    if attempts >= settings.MAIL_QUEUE_MAX_ATTEMPTS:
+        return None
+    delay = settings.MAIL_QUEUE_RETRY_DELAY * 2 ** (attempts - 1)
+    return now + timedelta(seconds=delay)
+
+
+def claim_queued_mail(batch_size):
+    """Take due mails off the queue for MAIL_QUEUE_CLAIM_TIMEOUT seconds.
+
+    The row locks are only held while the mails are claimed; mails of a
+    worker that dies before recording the outcome become due again.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        queued_mails = list(
+            QueuedMail.objects.select_for_update(skip_locked=True).filter(
+                sent_at__isnull=True,
+                next_attempt_at__lte=now
+            )[:batch_size]
+        )
+        QueuedMail.objects.filter(
+            pk__in=[queued.pk for queued in queued_mails]
+        ).update(next_attempt_at=now + timedelta(
+            seconds=settings.MAIL_QUEUE_CLAIM_TIMEOUT
+        ))
+    return queued_mails
+
+
+def send_queued_mail(batch_size):
+    """Send one batch of due mails, return the number of processed ones."""
+    queued_mails = claim_queued_mail(batch_size)
+    if queued_mails:
+        deliver_mail(queued_mails)
+    return len(queued_mails)
+
+
+def purge_mail_queue(older_than):
+    """Delete mails sent or given up on more than `older_than` seconds ago.
+
+    Failed mails record no failure time; all their retries fall well
+    within a retention period, so their creation time is used.
+    """
+    cutoff = timezone.now() - timedelta(seconds=older_than)
+    deleted, _ = QueuedMail.objects.filter(
+        Q(sent_at__lt=cutoff)
+        | Q(sent_at__isnull=True, next_attempt_at__isnull=True,
+            created_at__lt=cutoff)
+    ).delete()
+    return deleted
+
+
+def mail_queue_stats():
+    now = timezone.now()
+    return QueuedMail.objects.aggregate(
+        pending=Count('id', filter=Q(sent_at__isnull=True,
+                                     next_attempt_at__isnull=False)),
+        due=Count('id', filter=Q(sent_at__isnull=True,
+                                 next_attempt_at__lte=now)),
+        failed=Count('id', filter=Q(sent_at__isnull=True,
+                                    next_attempt_at__isnull=True)),
+        sent=Count('id', filter=Q(sent_at__isnull=False)),
     )
 
 
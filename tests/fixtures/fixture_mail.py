@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def eager_mail_queue(settings):
+    """Deliver queued mails immediately so tests can inspect mail.outbox."""
+    settings.MAIL_QUEUE_EAGER = True
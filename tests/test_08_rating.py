@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_reviews(self, client, admin_client, admin,
+                                       user, user_client):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'создании отзыва.'
+        )
+
+        create_single_review(user_client, title_id, 'Так себе', 2)
+        assert self.get_rating(client, title_id) == 3.5, (
+            'Проверьте, что рейтинг произведения равен средней оценке '
+            'всех отзывов.'
+        )
+
+        admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            ),
+            data={'score': 10}
+        )
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки отзыва.'
+        )
+
+        admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert self.get_rating(client, title_id) == 2, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+
+        user.delete()
+        assert self.get_rating(client, title_id) is None, (
+            'Если у произведения не осталось отзывов - значением поля '
+            '`rating` должно быть `None`.'
+        )
+        assert self.get_rating(client, titles[1]['id']) is None
+
+    def test_02_recalculate_ratings_command(self, client, admin_client,
+                                            admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        from reviews.models import Title
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+
+        call_command('recalculate_ratings')
+        assert self.get_rating(client, titles[0]['id']) == 5, (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'рейтинг произведений по отзывам.'
+        )
+        assert self.get_rating(client, titles[1]['id']) is None
+
+    def test_03_title_update_keeps_rating(self, client, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        from reviews.models import Title
+        title = Title.objects.get(pk=titles[0]['id'])
+        Title.objects.filter(pk=title.pk).update(
+            rating_sum=9, rating_count=1, rating=9
+        )
+        title.name = 'Новое название'
+        title.save()
+        assert self.get_rating(client, title.pk) == 9, (
+            'Проверьте, что сохранение произведения не перезаписывает '
+            'счётчики рейтинга, которые обновляются отзывами.'
+        )
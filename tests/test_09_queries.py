@@ -0,0 +1,213 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def create_more_titles(self, admin_client, categories, genres, count):
+        for idx in range(count):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx}',
+                'year': 2000,
+                'genre': [genres[0]['slug'], genres[1]['slug']],
+                'category': categories[0]['slug'],
+            })
+
+    def test_01_title_list(self, client, admin_client,
+                           django_assert_num_queries):
+        _, categories, genres = create_titles(admin_client)
+        # COUNT, titles joined with categories, genres prefetch.
+        with django_assert_num_queries(3):
+            client.get(self.TITLES_URL)
+
+        self.create_more_titles(admin_client, categories, genres, 10)
+        with django_assert_num_queries(3):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == 10, (
+            'Проверьте, что количество запросов к базе данных при '
+            f'GET-запросе к `{self.TITLES_URL}` не зависит от размера '
+            'страницы.'
+        )
+
+    def test_02_title_detail(self, client, admin_client,
+                             django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        with django_assert_num_queries(2):
+            client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id']
+                )
+            )
+
+    def test_03_title_create(self, admin_client, django_assert_num_queries):
+        _, categories, genres = create_titles(admin_client)
+        data = {
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug'], genres[1]['slug']],
+            'category': categories[0]['slug'],
+        }
+        # Genre slugs in one query, category slug, INSERT, statistics
+        # INSERT, m2m set (BEGIN, SELECT, missing ids for m2m_changed
+        # receivers, INSERT) and the genres of the response. The user comes
+        # from the authentication cache.
+        with django_assert_num_queries(9):
+            admin_client.post(self.TITLES_URL, data=data)
+
+    def test_04_title_update(self, admin_client, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        # Title with category, genres prefetch, UPDATE and the genres of
+        # the response.
+        with django_assert_num_queries(4):
+            admin_client.patch(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id']
+                ),
+                data={'name': 'Терминатор 2'}
+            )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09NestedQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_review_list_and_detail(self, client, admin_client, admin,
+                                       user, user_client,
+                                       django_assert_num_queries):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        # Title with its statistics (the review count) and reviews joined
+        # with authors.
+        with django_assert_num_queries(2):
+            client.get(url)
+        with django_assert_num_queries(2):
+            client.get(f'{url}{reviews[0]["id"]}/')
+
+    def test_02_review_create(self, admin_client, admin,
+                              django_assert_num_queries):
+        _, _, titles = create_comments(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        # Title, duplicate check, BEGIN, INSERT, the rating UPDATE and the
+        # statistics UPDATE.
+        with django_assert_num_queries(6):
+            admin_client.post(url, data={'text': 'Неплохо', 'score': 6})
+
+    def test_03_comment_list_and_create(self, client, admin_client, admin,
+                                        user, user_client,
+                                        django_assert_num_queries):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        # Review scoped to the title, COUNT and comments joined with authors.
+        with django_assert_num_queries(3):
+            client.get(url)
+        # Review scoped to the title, BEGIN, INSERT and the statistics
+        # UPDATE.
+        with django_assert_num_queries(4):
+            admin_client.post(url, data={'text': 'Согласен'})
+
+    def test_04_comment_of_another_title(self, client, admin_client, admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=reviews[0]['id']
+        )
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что GET-запрос к `{self.COMMENTS_URL_TEMPLATE}` '
+            'возвращает ответ со статусом 404, если отзыв относится к '
+            'другому произведению.'
+        )
+        response = admin_client.post(url, data={'text': 'Не туда'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09AuthenticationQueries:
+
+    USERS_ME_URL = '/api/v1/users/me/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def test_01_cached_user(self, user_client, admin_client, user,
+                            django_assert_num_queries):
+        user_client.get(self.USERS_ME_URL)
+        # Only the full profile, the user snapshot comes from the cache.
+        with django_assert_num_queries(1):
+            response = user_client.get(self.USERS_ME_URL)
+        assert response.json()['bio'] == user.bio
+
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        response = user_client.post(
+            self.CATEGORIES_URL, data={'name': 'Музыка', 'slug': 'music'}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что кеш пользователя сбрасывается при изменении '
+            'его роли.'
+        )
+
+        user.delete()
+        response = user_client.get(self.USERS_ME_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_02_token_role_is_not_trusted(self, admin):
+        client = APIClient()
+        admin.confirmation_code = 'secret'
+        admin.save()
+        response = client.post('/api/v1/auth/token/', data={
+            'username': admin.username, 'confirmation_code': 'secret'
+        })
+        assert response.status_code == HTTPStatus.OK
+        token = response.json()['token']
+        assert response.json()['refresh']
+
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что токен, полученный на `/api/v1/auth/token/`, '
+            'подходит для аутентификации.'
+        )
+
+        admin.role = 'user'
+        admin.save()
+        for method, url in (
+            ('get', '/api/v1/users/'), ('get', '/api/v1/metrics/'),
+            ('post', self.CATEGORIES_URL),
+        ):
+            response = getattr(client, method)(
+                url, data={'name': 'Музыка', 'slug': 'music'}
+            )
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                'Проверьте, что роль пользователя берётся не из токена, '
+                'а из актуальных данных, в том числе для GET-запросов.'
+            )
+
+        admin.role = 'admin'
+        admin.is_active = False
+        admin.save()
+        assert client.get('/api/v1/users/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что неактивный пользователь теряет доступ сразу.'
+        admin.delete()
+        assert client.get('/api/v1/users/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
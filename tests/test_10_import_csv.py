@@ -0,0 +1,67 @@
+import csv
+import os
+import shutil
+
+import pytest
+from django.core.management import call_command
+
+from tests.conftest import MANAGE_PATH
+
+DATA_DIR = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def count_rows(filename):
+    with open(os.path.join(DATA_DIR, filename), encoding='utf-8') as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10ImportCsv:
+
+    def test_01_import_shipped_data(self, client):
+        call_command('import_csv', batch_size=7)
+
+        from reviews.models import Category, Comment, Genre, Review, Title
+        from user.models import CustomUser
+        expected = (
+            ('users.csv', CustomUser),
+            ('category.csv', Category),
+            ('genre.csv', Genre),
+            ('titles.csv', Title),
+            ('genre_title.csv', Title.genre.through),
+            ('review.csv', Review),
+            ('comments.csv', Comment),
+        )
+        for filename, model in expected:
+            assert model.objects.count() == count_rows(filename), (
+                'Проверьте, что команда `import_csv` загружает все строки '
+                f'файла `{filename}`.'
+            )
+
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что при импорте сохраняется дата публикации из файла.'
+        )
+        response = client.get(f'/api/v1/titles/{review.title_id}/')
+        assert response.json()['rating'] is not None, (
+            'Проверьте, что после импорта отзывов пересчитывается рейтинг '
+            'произведений.'
+        )
+
+    def test_02_import_titles_only(self, tmp_path, admin):
+        for filename in (
+            'category.csv', 'genre.csv', 'titles.csv', 'genre_title.csv'
+        ):
+            shutil.copy(os.path.join(DATA_DIR, filename), tmp_path)
+        call_command('import_csv', path=tmp_path)
+
+        from reviews.models import Review, Title, TitleStats
+        assert TitleStats.objects.count() == Title.objects.count() == (
+            count_rows('titles.csv')
+        ), (
+            'Проверьте, что после импорта произведений без отзывов для '
+            'каждого произведения создаётся статистика.'
+        )
+        title = Title.objects.first()
+        Review.objects.create(title=title, author=admin, text='Ок', score=7)
+        assert TitleStats.objects.get(title=title).review_count == 1
@@ -0,0 +1,62 @@
+import csv
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.test_10_import_csv import DATA_DIR
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11Export:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/export/{dataset}/'
+
+    def test_01_export_command_mirrors_import(self, tmp_path):
+        call_command('import_csv')
+        call_command('export_data', 'titles', 'genre_title', path=tmp_path)
+
+        for filename in ('titles.csv', 'genre_title.csv'):
+            with open(f'{DATA_DIR}/{filename}', encoding='utf-8') as file:
+                expected = list(csv.reader(file))
+            with open(tmp_path / filename, encoding='utf-8') as file:
+                exported = list(csv.reader(file))
+            assert exported[0] == expected[0], (
+                f'Проверьте, что заголовок `{filename}` при экспорте '
+                'совпадает с файлом из `static/data`.'
+            )
+            assert sorted(exported[1:]) == sorted(expected[1:]), (
+                f'Проверьте, что экспорт `{filename}` содержит все строки.'
+            )
+
+    def test_02_export_endpoint(self, admin_client, user_client):
+        call_command('import_csv')
+        url = self.EXPORT_URL_TEMPLATE.format(dataset='review')
+
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{url}` доступен только администратору.'
+        )
+
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines[0] == 'id,title_id,text,author,score,pub_date'
+
+        response = admin_client.get(url, {'output': 'ndjson'})
+        records = [
+            json.loads(line) for line in
+            b''.join(response.streaming_content).decode().splitlines()
+        ]
+        with open(f'{DATA_DIR}/review.csv', encoding='utf-8') as file:
+            assert len(records) == sum(1 for _ in csv.DictReader(file))
+        assert set(records[0]) == {
+            'id', 'title_id', 'text', 'author', 'score', 'pub_date'
+        }
+
+        response = admin_client.get(
+            self.EXPORT_URL_TEMPLATE.format(dataset='unknown')
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
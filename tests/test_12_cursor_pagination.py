@@ -0,0 +1,46 @@
+import pytest
+
+from tests.utils import create_reviews, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12CursorPagination:
+
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_comments_cursor_pages(self, client, admin_client, admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        for idx in range(12):
+            create_single_comment(
+                admin_client, title_id, review_id, f'comment {idx}'
+            )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+
+        data = client.get(url).json()
+        assert data['count'] == 12, (
+            'Проверьте, что по умолчанию используется постраничная '
+            'пагинация с ключом `count`.'
+        )
+
+        data = client.get(url, {'pagination': 'cursor'}).json()
+        assert 'count' not in data, (
+            'Проверьте, что в режиме `?pagination=cursor` не выполняется '
+            'подсчёт количества объектов.'
+        )
+        first_page = [comment['text'] for comment in data['results']]
+        assert first_page == [f'comment {idx}' for idx in range(10)]
+        assert data['previous'] is None and data['next']
+
+        create_single_comment(admin_client, title_id, review_id, 'latest')
+        data = client.get(data['next']).json()
+        second_page = [comment['text'] for comment in data['results']]
+        assert second_page == ['comment 10', 'comment 11', 'latest'], (
+            'Проверьте, что курсорная пагинация не теряет и не дублирует '
+            'объекты при добавлении новых комментариев.'
+        )
+        assert data['next'] is None
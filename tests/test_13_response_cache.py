@@ -0,0 +1,110 @@
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def test_01_cached_catalogue(self, client, admin_client,
+                                 django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for url in (self.TITLES_URL, detail_url, self.CATEGORIES_URL):
+            first = client.get(url).json()
+            with django_assert_num_queries(0):
+                second = client.get(url).json()
+            assert first == second, (
+                f'Проверьте, что ответ на GET-запрос к `{url}` берётся '
+                'из кеша без обращения к базе данных.'
+            )
+
+    def test_02_invalidation(self, client, admin_client, user_client):
+        titles, categories, _ = create_titles(admin_client)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        other_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[1]['id']
+        )
+        client.get(self.TITLES_URL)
+        client.get(detail_url)
+        client.get(other_url)
+        client.get(self.CATEGORIES_URL)
+
+        admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Музыка', 'slug': 'music'}
+        )
+        data = client.get(self.CATEGORIES_URL).json()
+        assert data['count'] == len(categories) + 1, (
+            'Проверьте, что кеш списка категорий сбрасывается при '
+            'создании категории.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 8)
+        assert client.get(detail_url).json()['rating'] == 8, (
+            'Проверьте, что кеш произведения сбрасывается при изменении '
+            'его рейтинга.'
+        )
+        results = client.get(self.TITLES_URL).json()['results']
+        assert {title['id']: title['rating'] for title in results}[
+            titles[0]['id']
+        ] == 8
+
+        admin_client.patch(detail_url, data={'genre': ['drama']})
+        genres = client.get(detail_url).json()['genre']
+        assert [genre['slug'] for genre in genres] == ['drama'], (
+            'Проверьте, что кеш произведения сбрасывается при изменении '
+            'его жанров.'
+        )
+
+        admin_client.delete(f'{self.CATEGORIES_URL}books/')
+        assert client.get(other_url).status_code == 404, (
+            'Проверьте, что кеш произведения сбрасывается при удалении '
+            'его категории.'
+        )
+
+    def test_03_process_local_cache_warning(self, settings):
+        from api.checks import check_shared_cache
+        assert [
+            warning.id for warning in check_shared_cache(None)
+        ] == ['api.W001'], (
+            'Проверьте, что при кеше в памяти процесса выводится '
+            'предупреждение api.W001.'
+        )
+        settings.CACHES = {**settings.CACHES, 'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'api_cache',
+        }}
+        assert check_shared_cache(None) == []
+
+    def test_04_invalidation_after_commit(self, admin_client, user):
+        from django.db import transaction
+
+        from api.cache import (
+            CATEGORIES_GROUP, get_cache, get_versions, reviews_group
+        )
+        from reviews.models import Category, Review
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        groups = [CATEGORIES_GROUP, reviews_group(title_id)]
+        cache = get_cache()
+        before = get_versions(cache, groups)
+        with transaction.atomic():
+            Category.objects.create(name='Музыка', slug='music')
+            Review.objects.create(
+                title_id=title_id, author=user, text='Отлично', score=8
+            )
+            assert get_versions(cache, groups) == before, (
+                'Проверьте, что кеш сбрасывается только после фиксации '
+                'транзакции: иначе запрос до фиксации сохранит старые '
+                'данные под новой версией.'
+            )
+        after = get_versions(cache, groups)
+        assert all(new != old for new, old in zip(after, before))
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ConditionalGet:
+
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def check_not_modified(self, client, url, django_assert_num_queries):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        assert etag and response['Last-Modified'], (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовки `ETag` и `Last-Modified`.'
+        )
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304 без '
+            'обращения к базе данных.'
+        )
+        return etag
+
+    def test_01_not_modified_until_changed(self, client, admin_client,
+                                           admin, user_client,
+                                           django_assert_num_queries):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        title_url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+
+        title_etag = self.check_not_modified(
+            client, title_url, django_assert_num_queries
+        )
+        reviews_etag = self.check_not_modified(
+            client, reviews_url, django_assert_num_queries
+        )
+        comments_etag = self.check_not_modified(
+            client, comments_url, django_assert_num_queries
+        )
+
+        admin_client.patch(f'{reviews_url}{review_id}/', data={'text': 'Upd'})
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение отзыва меняет `ETag` списка отзывов.'
+        )
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        create_single_comment(user_client, title_id, review_id, 'Новый')
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 1
+
+        admin_client.patch(f'{reviews_url}{review_id}/', data={'score': 9})
+        response = client.get(title_url, HTTP_IF_NONE_MATCH=title_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение рейтинга меняет `ETag` произведения.'
+        )
+        assert response.json()['rating'] == 9
+
+    def test_02_username_change(self, client, admin_client, admin,
+                                user_client, user, django_assert_num_queries):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        create_single_comment(user_client, title_id, review_id, 'Новый')
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+        etags = {
+            url: self.check_not_modified(
+                client, url, django_assert_num_queries
+            )
+            for url in (reviews_url, comments_url)
+        }
+        user_client.patch('/api/v1/users/me/', data={'username': 'renamed'})
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что смена имени пользователя меняет `ETag` '
+                f'ответа на GET-запрос к `{url}` с его отзывами и '
+                'комментариями.'
+            )
+            assert response.json()['results'][0]['author'] == 'renamed'
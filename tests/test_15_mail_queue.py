@@ -0,0 +1,128 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15MailQueue:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client, idx):
+        response = client.post(self.URL_SIGNUP, data={
+            'username': f'user{idx}', 'email': f'user{idx}@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.OK
+
+    def test_01_signup_only_enqueues(self, client, settings):
+        settings.MAIL_QUEUE_EAGER = False
+        for idx in range(3):
+            self.signup(client, idx)
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что при регистрации письмо только ставится в '
+            'очередь и не отправляется во время запроса.'
+        )
+
+        from user.utils import mail_queue_stats
+        assert mail_queue_stats()['due'] == 3
+
+        call_command('send_queued_mail', once=True, batch_size=2)
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'user{idx}@yamdb.fake' for idx in range(3)
+        ]
+        stats = mail_queue_stats()
+        assert stats['sent'] == 3 and stats['pending'] == 0
+
+    def test_02_failed_mail_is_retried(self, client, settings, monkeypatch):
+        settings.MAIL_QUEUE_EAGER = False
+        settings.MAIL_QUEUE_MAX_ATTEMPTS = 2
+        self.signup(client, 1)
+
+        from django.core.mail.backends.locmem import EmailBackend
+
+        def broken_send(self, messages):
+            raise ConnectionError('SMTP is down')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', broken_send)
+        call_command('send_queued_mail', once=True)
+
+        from user.models import QueuedMail
+        queued = QueuedMail.objects.get()
+        assert queued.attempts == 1 and queued.sent_at is None
+        assert queued.next_attempt_at > queued.created_at, (
+            'Проверьте, что неотправленное письмо откладывается для '
+            'повторной попытки.'
+        )
+        assert queued.last_error == 'SMTP is down'
+
+        QueuedMail.objects.update(next_attempt_at=queued.created_at)
+        call_command('send_queued_mail', once=True)
+        queued.refresh_from_db()
+        assert queued.attempts == 2 and queued.next_attempt_at is None, (
+            'Проверьте, что после исчерпания попыток письмо больше не '
+            'отправляется.'
+        )
+
+    def test_03_connection_failure(self, client, settings, monkeypatch):
+        settings.MAIL_QUEUE_EAGER = False
+        for idx in range(2):
+            self.signup(client, idx)
+
+        from django.core.mail.backends.locmem import EmailBackend
+
+        def broken_open(self):
+            raise ConnectionRefusedError('SMTP login failed')
+
+        monkeypatch.setattr(EmailBackend, 'open', broken_open)
+        call_command('send_queued_mail', once=True)
+
+        from user.models import QueuedMail
+        for queued in QueuedMail.objects.all():
+            assert queued.attempts == 1 and queued.sent_at is None, (
+                'Проверьте, что ошибка подключения к почтовому серверу '
+                'засчитывается как неудачная попытка для всех писем пачки.'
+            )
+            assert queued.next_attempt_at > queued.created_at
+            assert queued.last_error == 'SMTP login failed'
+        assert len(mail.outbox) == 0
+
+        monkeypatch.undo()
+        QueuedMail.objects.update(next_attempt_at=timezone.now())
+        call_command('send_queued_mail', once=True)
+        assert len(mail.outbox) == 2
+
+    def test_04_purge(self, settings):
+        from datetime import timedelta
+
+        from user.models import QueuedMail
+        now = timezone.now()
+        old = now - timedelta(days=2)
+
+        def queue(name, created_at, **fields):
+            queued = QueuedMail.objects.create(
+                subject=name, body='code', recipient=f'{name}@yamdb.fake',
+                **fields
+            )
+            QueuedMail.objects.filter(pk=queued.pk).update(
+                created_at=created_at
+            )
+
+        queue('old_sent', old, sent_at=old, next_attempt_at=None)
+        queue('old_failed', old, next_attempt_at=None, attempts=5)
+        queue('recent_sent', now, sent_at=now, next_attempt_at=None)
+        queue('old_pending', old, next_attempt_at=now + timedelta(hours=1))
+        call_command('send_queued_mail', once=True, purge_older_than=3600)
+        assert sorted(
+            QueuedMail.objects.values_list('subject', flat=True)
+        ) == ['old_pending', 'recent_sent'], (
+            'Проверьте, что отправленные и неотправленные окончательно '
+            'письма с кодами удаляются по истечении срока хранения.'
+        )
+        settings.MAIL_QUEUE_RETENTION = 0
+        call_command('send_queued_mail', once=True)
+        assert list(
+            QueuedMail.objects.values_list('subject', flat=True)
+        ) == ['old_pending']
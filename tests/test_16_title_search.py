@@ -0,0 +1,52 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_ranked_prefix_search(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Орешки и белки',
+            'year': 2001,
+            'genre': [genres[1]['slug']],
+            'category': categories[1]['slug'],
+            'description': 'Крепкий чай и крепкий кофе, крепкий сон.'
+        })
+
+        assert self.search(client, 'креп') == [
+            'Орешки и белки', 'Крепкий орешек'
+        ], (
+            f'Проверьте, что поиск `{self.TITLES_URL}?search=` ищет по '
+            'началу слов в названии и описании и сортирует результаты по '
+            'релевантности.'
+        )
+        assert self.search(client, 'крепкий ОРЕШ') == [
+            'Орешки и белки', 'Крепкий орешек'
+        ]
+        assert self.search(client, 'back') == ['Терминатор']
+        assert self.search(client, 'пришельцы') == []
+        assert self.search(client, '"*') == []
+
+    def test_02_index_follows_changes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        admin_client.patch(url, data={'name': 'Робокоп'})
+        assert self.search(client, 'робо') == ['Робокоп'], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        assert self.search(client, 'терминатор') == []
+
+        admin_client.delete(url)
+        assert self.search(client, 'робо') == []
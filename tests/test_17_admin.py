@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17AdminChangelist:
+
+    CHANGELIST_URLS = (
+        '/admin/reviews/title/',
+        '/admin/reviews/review/',
+        '/admin/reviews/comment/',
+    )
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return len(context)
+
+    def test_01_queries_do_not_grow_with_rows(self, user_superuser):
+        from reviews.models import Comment, Review, Title
+        client = Client()
+        client.force_login(user_superuser)
+        call_command('import_csv')
+        before = {
+            url: self.count_queries(client, url)
+            for url in self.CHANGELIST_URLS
+        }
+
+        Title.objects.bulk_create(
+            Title(name=f'Новинка {idx}', year=2020) for idx in range(5)
+        )
+        review = Review.objects.first()
+        Comment.objects.bulk_create(
+            Comment(review=review, author=user_superuser, text=str(idx))
+            for idx in range(5)
+        )
+        for url in self.CHANGELIST_URLS:
+            assert self.count_queries(client, url) == before[url], (
+                f'Проверьте, что число запросов страницы `{url}` не зависит '
+                'от количества строк.'
+            )
+
+    @pytest.mark.parametrize('url,model,title_path', (
+        ('/admin/reviews/review/', 'Review', 'title__name'),
+        ('/admin/reviews/comment/', 'Comment', 'review__title__name'),
+    ))
+    def test_02_search_uses_indexes(self, user_superuser, url, model,
+                                    title_path):
+        from django.contrib import admin
+
+        import reviews.models as models
+        client = Client()
+        client.force_login(user_superuser)
+        call_command('import_csv')
+        model = getattr(models, model)
+        model_admin = admin.site._registry[model]
+        queryset = model.objects.all()
+        sample = queryset.select_related('author').first()
+        title_name = queryset.filter(pk=sample.pk).values_list(
+            title_path, flat=True
+        ).get()
+        prefix = title_name.split()[0]
+        username = sample.author.username
+        for term, expected in (
+            (prefix, queryset.filter(
+                **{f'{title_path}__startswith': prefix}
+            )),
+            (username, queryset.filter(author__username=username)),
+        ):
+            response = client.get(url, {'q': term})
+            assert response.status_code == HTTPStatus.OK
+            found, _ = model_admin.get_search_results(None, queryset, term)
+            assert set(found) == set(expected) and expected.exists(), (
+                f'Проверьте, что поиск на странице `{url}` находит записи '
+                'по имени автора и началу названия произведения.'
+            )
+            if connection.vendor != 'sqlite':
+                continue
+            sql, params = found.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plan = [row[-1] for row in cursor.fetchall()]
+            assert not any(step.startswith('SCAN') for step in plan), (
+                f'Проверьте, что поиск на странице `{url}` использует '
+                f'индексы, а не просмотр таблицы: {plan}'
+            )
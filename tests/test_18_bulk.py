@@ -0,0 +1,242 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tests.utils import create_categories, create_genre, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18BulkTitles:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def build_items(self, categories, genres, count):
+        return [
+            {
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'genre': [genres[0]['slug'], genres[1]['slug']],
+                'category': categories[0]['slug'],
+            }
+            for idx in range(count)
+        ]
+
+    def count_queries(self, admin_client, items):
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.BULK_URL, items, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'со списком корректных произведений возвращает ответ со '
+            'статусом 201.'
+        )
+        return len(context)
+
+    def test_01_bulk_create(self, admin_client):
+        categories = create_categories(admin_client)
+        genres = create_genre(admin_client)
+        items = self.build_items(categories, genres, 3)
+        response = admin_client.post(self.BULK_URL, items, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        data = response.json()
+        assert [item['name'] for item in data] == [
+            item['name'] for item in items
+        ], (
+            f'Проверьте, что POST-запрос к `{self.BULK_URL}` возвращает '
+            'созданные произведения в порядке запроса.'
+        )
+        assert all(item['id'] for item in data)
+        assert data[0]['genre'] == items[0]['genre']
+
+        response = admin_client.get(self.TITLES_URL)
+        assert response.json()['count'] == 3, (
+            f'Проверьте, что после POST-запроса к `{self.BULK_URL}` новые '
+            f'произведения видны в ответе на GET-запрос к `{self.TITLES_URL}`.'
+        )
+        genres_of_title = admin_client.get(
+            f'{self.TITLES_URL}{data[2]["id"]}/'
+        ).json()['genre']
+        assert sorted(genre['slug'] for genre in genres_of_title) == sorted(
+            items[2]['genre']
+        )
+
+    def test_02_queries_do_not_depend_on_slugs(self, admin_client):
+        categories = create_categories(admin_client)
+        genres = create_genre(admin_client)
+        few = self.count_queries(
+            admin_client, self.build_items(categories, genres, 2)
+        )
+        many = self.count_queries(
+            admin_client, self.build_items(categories, genres, 10)
+        )
+        # Without INSERT ... RETURNING each title is saved on its own: an
+        # INSERT of the title and one of its statistics.
+        per_item = (
+            0 if connection.features.can_return_rows_from_bulk_insert else 2
+        )
+        assert many - few == 8 * per_item, (
+            f'Проверьте, что POST-запрос к `{self.BULK_URL}` разрешает '
+            'слаги и записывает жанры одним запросом на весь список.'
+        )
+
+    def test_03_per_item_errors(self, admin_client):
+        categories = create_categories(admin_client)
+        genres = create_genre(admin_client)
+        items = self.build_items(categories, genres, 3)
+        items[1]['genre'] = ['no-such-genre']
+        del items[2]['name']
+        response = admin_client.post(self.BULK_URL, items, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == 3 and errors[0] == {}, (
+            f'Проверьте, что POST-запрос к `{self.BULK_URL}` с ошибками '
+            'возвращает список ошибок для каждого элемента.'
+        )
+        assert 'genre' in errors[1]
+        assert 'name' in errors[2]
+        assert admin_client.get(self.TITLES_URL).json()['count'] == 0, (
+            'Проверьте, что при ошибке в одном элементе не создаётся ни '
+            'одного произведения.'
+        )
+
+        response = admin_client.post(self.BULK_URL, items[0], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_bulk_update(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        items = [
+            {'id': titles[0]['id'], 'name': 'Терминатор 2'},
+            {'id': titles[1]['id'], 'genre': [genres[0]['slug']]},
+        ]
+        response = admin_client.patch(self.BULK_URL, items, format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что PATCH-запрос администратора к `{self.BULK_URL}` '
+            'возвращает ответ со статусом 200.'
+        )
+        first = admin_client.get(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        assert first.json()['name'] == 'Терминатор 2'
+        second = admin_client.get(f'{self.TITLES_URL}{titles[1]["id"]}/')
+        assert [genre['slug'] for genre in second.json()['genre']] == [
+            genres[0]['slug']
+        ]
+        assert second.json()['name'] == titles[1]['name']
+
+        response = admin_client.patch(
+            self.BULK_URL,
+            [{'id': titles[0]['id'], 'name': 'Т3'}, {'id': 0, 'name': 'X'}],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == [{}, {'id': ['Not found.']}], (
+            f'Проверьте, что PATCH-запрос к `{self.BULK_URL}` сообщает о '
+            'ненайденных элементах.'
+        )
+
+    def test_05_bulk_update_keys(self, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        title_id = titles[0]['id']
+        response = admin_client.patch(
+            self.BULK_URL,
+            [{'id': str(title_id), 'name': 'Т2'}],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что PATCH-запрос к `{self.BULK_URL}` принимает '
+            'ключ элемента в виде строки.'
+        )
+        items = [
+            {'id': title_id, 'genre': [genres[0]['slug']]},
+            {'id': str(title_id), 'genre': [g['slug'] for g in genres]},
+            {'id': [title_id]},
+            {'id': {'a': title_id}},
+            {'id': 'x'},
+            {'name': 'Без ключа'},
+        ]
+        response = admin_client.patch(self.BULK_URL, items, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что PATCH-запрос к `{self.BULK_URL}` с '
+            'повторяющимися или некорректными ключами возвращает ответ со '
+            'статусом 400.'
+        )
+        errors = response.json()
+        assert errors[0] == {} and all(
+            'id' in error for error in errors[1:]
+        ), (
+            'Проверьте, что ошибки ключей возвращаются для каждого элемента.'
+        )
+        response = admin_client.get(f'{self.TITLES_URL}{title_id}/')
+        assert response.json()['name'] == 'Т2'
+
+    def test_06_only_admin(self, user_client, moderator_client):
+        response = APIClient().post(self.BULK_URL, [], format='json')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        for other_client in (user_client, moderator_client):
+            response = other_client.post(self.BULK_URL, [], format='json')
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                f'Проверьте, что `{self.BULK_URL}` доступен только '
+                'администратору.'
+            )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18BulkGenresAndCategories:
+
+    URLS = ('/api/v1/genres/', '/api/v1/categories/')
+
+    @pytest.mark.parametrize('url', URLS)
+    def test_01_bulk_create(self, admin_client, url):
+        items = [
+            {'name': 'Первый', 'slug': 'first'},
+            {'name': 'Второй', 'slug': 'second'},
+        ]
+        response = admin_client.post(f'{url}bulk/', items, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json() == items
+        assert admin_client.get(url).json()['count'] == 2, (
+            f'Проверьте, что POST-запрос к `{url}bulk/` создаёт все объекты.'
+        )
+
+    @pytest.mark.parametrize('url', URLS)
+    def test_02_duplicate_slugs(self, admin_client, url):
+        admin_client.post(
+            f'{url}bulk/', [{'name': 'Первый', 'slug': 'first'}],
+            format='json'
+        )
+        items = [
+            {'name': 'Новый', 'slug': 'new'},
+            {'name': 'Снова первый', 'slug': 'first'},
+            {'name': 'Снова новый', 'slug': 'new'},
+        ]
+        response = admin_client.post(f'{url}bulk/', items, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert errors[0] == {}, (
+            f'Проверьте, что POST-запрос к `{url}bulk/` возвращает ошибки '
+            'для каждого элемента.'
+        )
+        assert 'slug' in errors[1] and 'slug' in errors[2], (
+            f'Проверьте, что POST-запрос к `{url}bulk/` отклоняет занятые '
+            'и повторяющиеся слаги.'
+        )
+        assert admin_client.get(url).json()['count'] == 1
+
+    @pytest.mark.parametrize('url', URLS)
+    def test_03_bulk_update(self, admin_client, url):
+        admin_client.post(
+            f'{url}bulk/', [{'name': 'Первый', 'slug': 'first'}],
+            format='json'
+        )
+        response = admin_client.patch(
+            f'{url}bulk/', [{'slug': 'first', 'name': 'Новое имя'}],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert admin_client.get(url).json()['results'] == [
+            {'name': 'Новое имя', 'slug': 'first'}
+        ], (
+            f'Проверьте, что PATCH-запрос к `{url}bulk/` обновляет объекты '
+            'и сбрасывает кэш списка.'
+        )
@@ -0,0 +1,56 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Benchmark:
+
+    def seed(self):
+        call_command(
+            'seed_data', titles=5, users=3, reviews=20, comments=40,
+            genres=3, categories=2
+        )
+
+    def test_01_seed_data(self):
+        from reviews.models import Comment, Review, Title
+        from user.models import CustomUser
+        self.seed()
+        assert Title.objects.count() == 5
+        assert Review.objects.count() == 20
+        assert Comment.objects.count() == 40
+        assert CustomUser.objects.count() == 4, (
+            'Проверьте, что `seed_data` создаёт столько пользователей, '
+            'чтобы каждый оставил не больше одного отзыва на произведение.'
+        )
+        assert Title.genre.through.objects.count() == 10
+        assert Title.objects.filter(rating__isnull=True).count() == 0, (
+            'Проверьте, что `seed_data` пересчитывает рейтинги.'
+        )
+
+    def test_02_no_query_regressions(self, settings):
+        settings.MAIL_QUEUE_EAGER = False
+        self.seed()
+        # Query counts must not depend on the size of the dataset, so the
+        # baseline recorded on a bigger one applies here as well.
+        call_command('benchmark_api', iterations=2, queries_only=True)
+
+    def test_03_regressions_are_reported(self):
+        from api.benchmark import find_regressions
+        baseline = {
+            'titles-list': {'queries': 3, 'p50_ms': 10, 'peak_kib': 100},
+        }
+        results = {
+            'titles-list': {'queries': 4, 'p50_ms': 12, 'peak_kib': 200},
+            'genres-list': {'queries': 9, 'p50_ms': 1, 'peak_kib': 1},
+        }
+        regressions = find_regressions(results, baseline, tolerance=0.5)
+        assert len(regressions) == 2, (
+            'Проверьте, что `find_regressions` сообщает о росте числа '
+            'запросов и памяти сверх допуска.'
+        )
+        assert len(find_regressions(results, baseline, tolerance=None)) == 1
+
+    def test_04_empty_database(self):
+        with pytest.raises(CommandError):
+            call_command('benchmark_api', iterations=1, queries_only=True)
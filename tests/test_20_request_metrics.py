@@ -0,0 +1,144 @@
+import json
+import logging
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20RequestMetrics:
+
+    TITLES_URL = '/api/v1/titles/'
+    METRICS_URL = '/api/v1/metrics/'
+
+    @pytest.fixture(autouse=True)
+    def instrumentation(self, settings):
+        settings.API_INSTRUMENTATION = True
+
+    def test_01_server_timing(self, admin_client, settings):
+        settings.API_SERVER_TIMING = True
+        create_titles(admin_client)
+        response = APIClient().get(self.TITLES_URL)
+        header = response.get('Server-Timing', '')
+        for metric in ('db;dur=', 'serialize;dur=', 'render;dur=', 'app;dur=',
+                       'total;dur='):
+            assert metric in header, (
+                'Проверьте, что ответ содержит заголовок `Server-Timing` с '
+                f'метрикой `{metric}`.'
+            )
+        assert 'desc="3 queries"' in header
+
+        settings.API_SERVER_TIMING = False
+        response = APIClient().get(self.TITLES_URL)
+        assert 'Server-Timing' not in response
+
+    def test_02_counters(self, admin_client, user_client):
+        create_titles(admin_client)
+        admin_client.delete(self.METRICS_URL)
+        APIClient().get(self.TITLES_URL)
+        APIClient().get(self.TITLES_URL)
+        response = admin_client.get(self.METRICS_URL)
+        assert response.status_code == HTTPStatus.OK
+        counters = response.json()['TitleViewSet.list']
+        assert counters['requests'] == 2, (
+            f'Проверьте, что `{self.METRICS_URL}` считает запросы по '
+            'представлению и действию.'
+        )
+        assert counters['queries'] >= 2
+        assert counters['bytes'] > 0
+        assert user_client.get(self.METRICS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+
+    def test_03_slow_request_log(self, admin_client, settings, caplog):
+        create_titles(admin_client)
+        settings.API_SLOW_REQUEST_MS = 0
+        with caplog.at_level(logging.WARNING, logger='api.requests'):
+            APIClient().get(self.TITLES_URL)
+        records = [
+            record for record in caplog.records
+            if record.name == 'api.requests'
+        ]
+        assert len(records) == 1, (
+            'Проверьте, что медленные запросы пишутся в лог `api.requests`.'
+        )
+        entry = json.loads(records[0].args[0])
+        assert entry['endpoint'] == 'TitleViewSet.list'
+        assert entry['queries'] == 3
+        assert entry['duplicates'] == []
+
+    def test_04_duplicated_statements(self):
+        from api.middleware import RequestMetrics
+        metrics = RequestMetrics()
+
+        def execute(sql, params, many, context):
+            return None
+
+        for pk in range(3):
+            metrics(execute, 'SELECT * FROM t WHERE id = %s', (pk,), False,
+                    {})
+        metrics(execute, 'SELECT 1', (), False, {})
+        assert metrics.queries == 4
+        assert metrics.duplicates() == [
+            {'sql': 'SELECT * FROM t WHERE id = %s', 'count': 3}
+        ], (
+            'Проверьте, что повторяющиеся запросы (признак N+1) '
+            'попадают в лог.'
+        )
+
+    def test_05_disabled(self, settings):
+        settings.API_INSTRUMENTATION = False
+        response = APIClient().get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert 'Server-Timing' not in response
+
+    def test_06_streaming_export(self, admin_client):
+        create_titles(admin_client)
+        admin_client.delete(self.METRICS_URL)
+        response = admin_client.get('/api/v1/export/genre/')
+        content = b''.join(response.streaming_content)
+        counters = admin_client.get(self.METRICS_URL).json()
+        counters = counters['ExportView.get']
+        assert counters['requests'] == 1
+        assert counters['queries'] >= 1, (
+            'Проверьте, что запросы к базе во время чтения потокового '
+            'ответа учитываются в метриках.'
+        )
+        assert counters['bytes'] == len(content)
+
+    @pytest.mark.parametrize('row_lists', (False, True))
+    def test_07_serialization_time(self, admin_client, settings, monkeypatch,
+                                   row_lists):
+        import time
+
+        from api.rows import TitleRowSerializer
+        from api.serializers import TitleStatsSerializer
+        settings.API_SERVER_TIMING = True
+        settings.API_ROW_LISTS = row_lists
+        titles, _, _ = create_titles(admin_client)
+        # Nested in every title: its time belongs to the title item.
+        serializer_class = (
+            TitleRowSerializer if row_lists else TitleStatsSerializer
+        )
+        represent = serializer_class.to_representation
+
+        def slow_representation(self, instance):
+            time.sleep(0.05)
+            return represent(self, instance)
+
+        monkeypatch.setattr(
+            serializer_class, 'to_representation', slow_representation
+        )
+        response = APIClient().get(self.TITLES_URL)
+        timings = {
+            metric.split(';')[0]: float(metric.split('dur=')[1].split(';')[0])
+            for metric in response['Server-Timing'].split(', ')
+        }
+        assert timings['serialize'] >= 50 * len(titles), (
+            'Проверьте, что время сериализации объектов учитывается '
+            'в метрике `serialize`, а не в `app`.'
+        )
+        assert timings['app'] < 50
@@ -0,0 +1,40 @@
+import pytest
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connection
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Database:
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='SQLite pragmas only'
+    )
+    def test_01_sqlite_pragmas(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            busy_timeout = cursor.fetchone()[0]
+            cursor.execute('PRAGMA synchronous')
+            synchronous = cursor.fetchone()[0]
+        assert busy_timeout == settings.SQLITE_PRAGMAS['busy_timeout'], (
+            'Проверьте, что настройки SQLITE_PRAGMAS применяются к новым '
+            'соединениям.'
+        )
+        assert synchronous == 1
+
+    def test_02_broken_connection_is_dropped(self, monkeypatch, settings):
+        settings.DB_HEALTH_CHECKS = True
+        connection.ensure_connection()
+        monkeypatch.setitem(connection.settings_dict, 'CONN_MAX_AGE', 60)
+        # Not expired: only the health check may close the connection.
+        monkeypatch.setattr(connection, 'close_at', None)
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        monkeypatch.setattr(connection, 'close', lambda: setattr(
+            connection, 'closed_by_check', True
+        ))
+        request_started.send(sender=None)
+        assert getattr(connection, 'closed_by_check', False), (
+            'Проверьте, что постоянное соединение проверяется в начале '
+            'запроса и закрывается, если оно разорвано.'
+        )
+        del connection.closed_by_check
@@ -0,0 +1,41 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Checks SQLite query plans'
+)
+@pytest.mark.django_db(transaction=True)
+class Test22Indexes:
+
+    EXPECTED_INDEXES = {
+        'reviews-list': 'review_title_pub_date_idx',
+        'reviews-cursor': 'review_title_pub_date_idx',
+        'reviews-count': 'review_title_pub_date_idx',
+        'comments-list': 'comment_review_pub_date_idx',
+        'author-reviews': 'review_author_pub_date_idx',
+        'titles-category-year': 'title_category_year_idx',
+        'titles-name': 'title_name_idx',
+        'titles-top-rated': 'title_rating_idx',
+        'titles-years': 'title_year_idx',
+        'titles-most-reviewed': 'title_stats_reviews_idx',
+    }
+
+    def test_01_list_queries_use_composite_indexes(self):
+        from api.benchmark import Fixture, query_plans
+        call_command(
+            'seed_data', titles=5, users=3, reviews=20, comments=40,
+            genres=3, categories=2
+        )
+        plans = query_plans(Fixture())
+        for name, index in self.EXPECTED_INDEXES.items():
+            assert index in plans[name], (
+                f'Проверьте, что запрос `{name}` использует индекс `{index}`:'
+                f'\n{plans[name]}'
+            )
+            assert 'TEMP B-TREE' not in plans[name], (
+                f'Проверьте, что запрос `{name}` получает строки в порядке '
+                f'индекса без сортировки:\n{plans[name]}'
+            )
+        assert 'COVERING INDEX' in plans['reviews-count']
@@ -0,0 +1,128 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import (
+    create_single_comment, create_single_review, create_titles
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TitleStats:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_stats(self, client, title_id):
+        response = client.get(f'{self.TITLES_URL}{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['stats']
+
+    def test_01_counters_follow_reviews_and_comments(
+            self, client, admin_client, user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        stats = self.get_stats(client, title_id)
+        assert stats['review_count'] == 0
+        assert stats['last_activity'] is None
+        assert stats['scores'] == {str(score): 0 for score in range(1, 11)}
+
+        review = create_single_review(
+            admin_client, title_id, 'Шедевр', 10
+        ).json()
+        create_single_review(user_client, title_id, 'Неплохо', 7)
+        create_single_comment(moderator_client, title_id, review['id'], '+')
+        create_single_comment(user_client, title_id, review['id'], '+1')
+        stats = self.get_stats(client, title_id)
+        assert stats['review_count'] == 2, (
+            'Проверьте, что `stats.review_count` произведения растёт при '
+            'создании отзыва.'
+        )
+        assert stats['comment_count'] == 2, (
+            'Проверьте, что `stats.comment_count` произведения растёт при '
+            'создании комментария.'
+        )
+        assert stats['scores']['10'] == 1 and stats['scores']['7'] == 1
+        assert stats['last_activity'] is not None
+
+        review_url = f'{self.TITLES_URL}{title_id}/reviews/{review["id"]}/'
+        admin_client.patch(review_url, data={'score': 7})
+        stats = self.get_stats(client, title_id)
+        assert stats['scores']['10'] == 0 and stats['scores']['7'] == 2, (
+            'Проверьте, что гистограмма оценок обновляется при изменении '
+            'оценки отзыва.'
+        )
+
+        admin_client.delete(review_url)
+        stats = self.get_stats(client, title_id)
+        assert stats['review_count'] == 1
+        assert stats['comment_count'] == 0, (
+            'Проверьте, что при удалении отзыва учитываются удалённые '
+            'вместе с ним комментарии.'
+        )
+        assert stats['scores']['7'] == 1
+
+    def test_02_list_has_stats(self, client, admin_client,
+                               django_assert_num_queries):
+        create_titles(admin_client)
+        # Statistics are joined to the titles query.
+        with django_assert_num_queries(3):
+            response = client.get(self.TITLES_URL)
+        assert all(
+            title['stats']['review_count'] == 0
+            for title in response.json()['results']
+        )
+
+    def test_03_recalculate(self, client, admin_client, admin):
+        from reviews.models import Review, TitleStats
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        Review.objects.bulk_create([
+            Review(title_id=title_id, author=admin, text='bulk', score=3)
+        ])
+        TitleStats.objects.filter(title_id=titles[1]['id']).delete()
+        call_command('recalculate_ratings')
+        stats = self.get_stats(client, title_id)
+        assert stats['review_count'] == 1 and stats['scores']['3'] == 1, (
+            'Проверьте, что `recalculate_ratings` пересчитывает статистику '
+            'произведений.'
+        )
+        assert self.get_stats(client, titles[1]['id']) is not None, (
+            'Проверьте, что `recalculate_ratings` создаёт недостающие '
+            'строки статистики.'
+        )
+
+    def test_04_cascade_delete_queries(self, client, admin_client, admin,
+                                       user, django_assert_max_num_queries):
+        from reviews.models import Comment, Review, Title
+        titles, _, _ = create_titles(admin_client)
+
+        def review_with_comments(title_id, author, number):
+            review = Review.objects.create(
+                title_id=title_id, author=author, text='Отзыв', score=5
+            )
+            for idx in range(number):
+                Comment.objects.create(
+                    review=review, author=admin, text=f'{idx}'
+                )
+            return review
+
+        kept = review_with_comments(titles[0]['id'], admin, 2)
+        deleted = review_with_comments(titles[0]['id'], user, 20)
+        # Collecting, deleting comments and the review, one rating and one
+        # statistics UPDATE: nothing per comment.
+        with django_assert_max_num_queries(8):
+            deleted.delete()
+        stats = self.get_stats(client, titles[0]['id'])
+        assert stats['review_count'] == 1
+        assert stats['comment_count'] == 2, (
+            'Проверьте, что комментарии удалённого отзыва вычитаются из '
+            'статистики одним запросом.'
+        )
+        assert stats['scores']['5'] == 1
+
+        review_with_comments(titles[0]['id'], user, 20)
+        with django_assert_max_num_queries(14):
+            Title.objects.get(pk=titles[0]['id']).delete()
+        assert not Review.objects.filter(pk=kept.pk).exists()
+        assert not Comment.objects.exists()
@@ -0,0 +1,114 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24TitleOrdering:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def create_rated_titles(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        terminator, die_hard = titles[0]['id'], titles[1]['id']
+        create_single_review(admin_client, terminator, 'Неплохо', 4)
+        create_single_review(admin_client, die_hard, 'Шедевр', 9)
+        create_single_review(user_client, die_hard, 'Отлично', 8)
+        return terminator, die_hard
+
+    def get_ids(self, client, query):
+        response = client.get(f'{self.TITLES_URL}?{query}')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}?{query}` '
+            'возвращает ответ со статусом 200.'
+        )
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_ordering(self, client, admin_client, user_client):
+        terminator, die_hard = self.create_rated_titles(
+            admin_client, user_client
+        )
+        assert self.get_ids(client, 'ordering=-rating') == [
+            die_hard, terminator
+        ], (
+            'Проверьте, что параметр `ordering=-rating` сортирует '
+            'произведения по убыванию рейтинга.'
+        )
+        assert self.get_ids(client, 'ordering=rating') == [
+            terminator, die_hard
+        ]
+        assert self.get_ids(client, 'ordering=-year,name') == [
+            die_hard, terminator
+        ]
+        assert self.get_ids(client, 'ordering=reviews') == [
+            terminator, die_hard
+        ], (
+            'Проверьте, что параметр `ordering=reviews` сортирует '
+            'произведения по количеству отзывов.'
+        )
+
+    def test_02_ranges(self, client, admin_client, user_client):
+        terminator, die_hard = self.create_rated_titles(
+            admin_client, user_client
+        )
+        assert self.get_ids(client, 'year_min=1985') == [die_hard], (
+            'Проверьте, что параметр `year_min` отбирает произведения '
+            'не старше указанного года.'
+        )
+        assert self.get_ids(client, 'year_max=1985') == [terminator]
+        assert self.get_ids(client, 'year_min=1984&year_max=1988') == [
+            terminator, die_hard
+        ]
+        assert self.get_ids(client, 'rating_min=5') == [die_hard], (
+            'Проверьте, что параметр `rating_min` отбирает произведения '
+            'с рейтингом не ниже указанного.'
+        )
+        assert self.get_ids(client, 'reviews_min=2') == [die_hard], (
+            'Проверьте, что параметр `reviews_min` отбирает произведения '
+            'с указанным минимумом отзывов.'
+        )
+
+    def test_03_unknown_ordering(self, client, admin_client):
+        create_titles(admin_client)
+        for query in ('ordering=rating_sum', 'year_min=abc'):
+            response = client.get(f'{self.TITLES_URL}?{query}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что GET-запрос к `{self.TITLES_URL}?{query}` '
+                'возвращает ответ со статусом 400.'
+            )
+
+    def test_04_unrated_last(self, client, admin_client, user_client):
+        terminator, die_hard = self.create_rated_titles(
+            admin_client, user_client
+        )
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Без оценок', 'year': 2000, 'category': 'films'
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        unrated = response.json()['id']
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Тоже без оценок', 'year': 2001, 'category': 'films'
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        also_unrated = response.json()['id']
+        assert self.get_ids(client, '') == [
+            terminator, die_hard, unrated, also_unrated
+        ], (
+            'Проверьте, что по умолчанию произведения отсортированы по '
+            'возрастанию рейтинга, без рейтинга - последними, а равные '
+            'значения - по id.'
+        )
+        assert self.get_ids(client, 'ordering=-rating') == [
+            die_hard, terminator, also_unrated, unrated
+        ], (
+            'Проверьте, что произведения без рейтинга идут последними при '
+            'сортировке по убыванию рейтинга на любой базе данных.'
+        )
+        assert self.get_ids(client, 'ordering=rating') == [
+            terminator, die_hard, unrated, also_unrated
+        ], (
+            'Проверьте, что произведения без рейтинга идут последними при '
+            'сортировке по возрастанию рейтинга.'
+        )
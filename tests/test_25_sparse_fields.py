@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_title_fields(self, client, admin_client,
+                             django_assert_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        url = f'{self.TITLES_URL}?fields=id,name,category'
+        # No genre prefetch: the count and the page only.
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        title = next(
+            item for item in response.json()['results']
+            if item['id'] == titles[0]['id']
+        )
+        assert title == {
+            'id': titles[0]['id'],
+            'name': titles[0]['name'],
+            'category': categories[0]['slug'],
+        }, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает только '
+            'запрошенные поля, а связанные объекты - в виде slug.'
+        )
+
+    def test_02_title_expand(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/?fields=name&expand=genre'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert set(data) == {'name', 'genre'}
+        assert sorted(data['genre'], key=lambda genre: genre['slug']) == (
+            sorted(genres[:2], key=lambda genre: genre['slug'])
+        ), (
+            f'Проверьте, что GET-запрос к `{url}` возвращает полные '
+            'объекты связей, перечисленных в `expand`.'
+        )
+        response = client.get(f'{self.TITLES_URL}?expand=category')
+        assert response.json() == client.get(self.TITLES_URL).json(), (
+            'Проверьте, что `expand` без `fields` не сворачивает связи и '
+            'возвращает полный ответ.'
+        )
+
+    def test_03_review_fields(self, client, admin_client, user, user_client,
+                              django_assert_num_queries):
+        _, titles = create_reviews(admin_client, {user: user_client})
+        title_id = titles[0]['id']
+        url = f'{self.TITLES_URL}{title_id}/reviews/?fields=id,score'
+        # The title with its review count and the page, without joining
+        # authors.
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        reviews = response.json()['results']
+        assert reviews and all(
+            set(review) == {'id', 'score'} for review in reviews
+        ), (
+            f'Проверьте, что GET-запрос к `{url}` возвращает только '
+            'запрошенные поля отзывов.'
+        )
+        response = client.get(
+            f'{self.TITLES_URL}{title_id}/reviews/?fields=author'
+            '&pagination=cursor'
+        )
+        assert response.json()['results'][0] == {'author': user.username}
+
+    def test_04_unknown_fields(self, client, admin_client):
+        create_titles(admin_client)
+        for query in ('fields=id,secret', 'expand=stats', 'expand=name'):
+            response = client.get(f'{self.TITLES_URL}?{query}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что GET-запрос к `{self.TITLES_URL}?{query}` '
+                'возвращает ответ со статусом 400.'
+            )
@@ -0,0 +1,72 @@
+import pytest
+from rest_framework.test import APIClient
+
+from tests.utils import create_comments
+
+# Serializer lists first, then row lists without and with cached encoded
+# items; the last mode runs twice to read the items back from the cache.
+MODES = ((False, False), (True, False), (True, True), (True, True))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26RowLists:
+
+    def compare(self, settings, url):
+        from api.cache import get_cache
+        get_cache().clear()
+        contents = []
+        for row_lists, fragments in MODES:
+            settings.API_ROW_LISTS = row_lists
+            settings.API_JSON_FRAGMENTS = fragments
+            response = APIClient().get(url)
+            assert response.status_code == 200
+            contents.append(response.content)
+        serializer_content = contents[0]
+        for content in contents[1:]:
+            assert content == serializer_content, (
+                f'Проверьте, что список `{url}`, собранный из строк '
+                'values(), совпадает с ответом сериализатора байт в байт.'
+            )
+
+    def test_01_parity(self, settings, admin_client, admin, user,
+                       user_client, moderator, moderator_client):
+        from api.urls import router_v1
+        from reviews.models import Title, TitleStats
+        _, reviews, titles = create_comments(admin_client, {
+            admin: admin_client, user: user_client,
+            moderator: moderator_client
+        })
+        bare = Title.objects.create(name='Без категории', year=2000)
+        TitleStats.objects.filter(title=bare).delete()
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        urls = {
+            'titles': (
+                '/api/v1/titles/',
+                '/api/v1/titles/?ordering=-rating&year_min=1900',
+                '/api/v1/titles/?search=Терминатор',
+            ),
+            'categories': (
+                '/api/v1/categories/', '/api/v1/categories/?search=Фил',
+            ),
+            'genre': ('/api/v1/genres/', '/api/v1/genres/?search=ужас'),
+            'reviews': (
+                f'/api/v1/titles/{title_id}/reviews/',
+                f'/api/v1/titles/{title_id}/reviews/?pagination=cursor',
+            ),
+            'comments': (
+                f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+                f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+                '?pagination=cursor',
+            ),
+        }
+        row_lists = {
+            basename for _, viewset, basename in router_v1.registry
+            if getattr(viewset, 'row_serializer_class', None) is not None
+        }
+        assert row_lists == set(urls), (
+            'Проверьте, что каждый список со строками values() проверяется '
+            'на совпадение с ответом сериализатора.'
+        )
+        for basename in sorted(urls):
+            for url in urls[basename]:
+                self.compare(settings, url)
@@ -0,0 +1,97 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from tests.utils import create_single_review, create_titles
+
+
+class Test27Renderer:
+
+    def test_01_same_bytes_as_json_renderer(self):
+        from api.renderers import ORJSONRenderer
+        data = {
+            'text': 'Привет \u2028 мир \u2029 "кавычки" \n',
+            'numbers': [1, 2.5, 1.0, -3, None, True],
+            'nested': {'scores': {1: 2, '10': 0}},
+            'date': datetime.datetime(
+                2021, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc
+            ),
+            'day': datetime.date(2021, 5, 1),
+            'decimal': Decimal('7.50'),
+            'lazy': gettext_lazy('This field is required.'),
+        }
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data), (
+            'Проверьте, что ORJSONRenderer выдаёт те же байты, что и '
+            'JSONRenderer.'
+        )
+        assert ORJSONRenderer().render(None) == b''
+
+    def test_02_encoded_list(self):
+        from api.renderers import EncodedList, ORJSONRenderer
+        data = {'count': 2, 'results': EncodedList([b'{"a":1}', b'[]'])}
+        assert ORJSONRenderer().render(data) == (
+            b'{"count":2,"results":[{"a":1},[]]}'
+        ), 'Проверьте, что закодированные элементы вставляются как есть.'
+        assert ORJSONRenderer().render(
+            data, 'application/json; indent=2'
+        ) == JSONRenderer().render(
+            {'count': 2, 'results': [{'a': 1}, []]},
+            'application/json; indent=2'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Fragments:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_fragments_follow_changes(self, admin_client, settings,
+                                         django_assert_num_queries):
+        from api.cache import TITLES_GROUP, invalidate
+        settings.API_ROW_LISTS = settings.API_JSON_FRAGMENTS = True
+        from api.renderers import decode
+        titles, _, genres = create_titles(admin_client)
+        response = APIClient().get(self.TITLES_URL)
+        assert response.content == JSONRenderer().render(
+            decode(response.data)
+        )
+        invalidate(TITLES_GROUP)
+        # Every title is encoded already: no genre query.
+        with django_assert_num_queries(2):
+            cached = APIClient().get(self.TITLES_URL)
+        assert cached.content == response.content, (
+            'Проверьте, что список собирается из сохранённых фрагментов '
+            'без изменения ответа.'
+        )
+
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 9)
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[1]["id"]}/', data={'name': 'Новое'}
+        )
+        results = {
+            title['id']: title
+            for title in APIClient().get(self.TITLES_URL).json()['results']
+        }
+        assert results[titles[0]['id']]['rating'] == 9
+        assert results[titles[0]['id']]['stats']['review_count'] == 1, (
+            'Проверьте, что фрагмент произведения обновляется после '
+            'нового отзыва.'
+        )
+        assert results[titles[1]['id']]['name'] == 'Новое'
+
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        results = {
+            title['id']: title
+            for title in APIClient().get(self.TITLES_URL).json()['results']
+        }
+        assert genres[0]['slug'] not in [
+            genre['slug'] for genre in results[titles[0]['id']]['genre']
+        ], (
+            'Проверьте, что фрагменты произведений обновляются после '
+            'удаления жанра.'
+        )
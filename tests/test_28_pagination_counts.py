@@ -0,0 +1,108 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tests.utils import create_reviews, create_titles
+
+
+def count_queries(url):
+    with CaptureQueriesContext(connection) as context:
+        response = APIClient().get(url)
+    assert response.status_code == HTTPStatus.OK
+    counts = [
+        query for query in context.captured_queries
+        if 'COUNT(' in query['sql']
+    ]
+    return response.json(), len(counts)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28PaginationCounts:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def create_many_titles(self, admin_client, number):
+        response = admin_client.post(f'{self.TITLES_URL}bulk/', data=[
+            {'name': f'Произведение {idx}', 'year': 2000, 'genre': [],
+             'category': 'films'}
+            for idx in range(number)
+        ], format='json')
+        assert response.status_code == HTTPStatus.CREATED
+
+    def test_01_count_is_cached(self, admin_client):
+        create_titles(admin_client)
+        self.create_many_titles(admin_client, 10)
+        data, counts = count_queries(self.TITLES_URL)
+        assert data['count'] == 12 and counts == 1
+        data, counts = count_queries(f'{self.TITLES_URL}?page=2')
+        assert data['count'] == 12
+        assert counts == 0, (
+            'Проверьте, что количество объектов списка кешируется и не '
+            'пересчитывается для каждой страницы.'
+        )
+        data, counts = count_queries(f'{self.TITLES_URL}?year=1984&page=1')
+        assert data['count'] == 1 and counts == 1
+
+        self.create_many_titles(admin_client, 1)
+        data, counts = count_queries(f'{self.TITLES_URL}?page=2')
+        assert data['count'] == 13, (
+            'Проверьте, что кешированное количество сбрасывается при '
+            'изменении произведений.'
+        )
+
+    def test_02_review_count_from_statistics(self, admin_client, admin, user,
+                                             user_client):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        data, counts = count_queries(url)
+        assert data['count'] == 2
+        assert counts == 0, (
+            'Проверьте, что количество отзывов берётся из статистики '
+            'произведения без запроса COUNT.'
+        )
+        admin_client.delete(f'{url}{data["results"][0]["id"]}/')
+        data, _ = count_queries(url)
+        assert data['count'] == 1 and len(data['results']) == 1
+
+    def test_03_without_count(self, admin_client):
+        create_titles(admin_client)
+        self.create_many_titles(admin_client, 9)
+        data, counts = count_queries(f'{self.TITLES_URL}?count=false')
+        assert 'count' not in data and counts == 0, (
+            'Проверьте, что с параметром `count=false` список отдаётся '
+            'без общего количества и без запроса COUNT.'
+        )
+        assert len(data['results']) == 10
+        assert data['previous'] is None
+        assert 'page=2' in data['next']
+        data, _ = count_queries(f'{self.TITLES_URL}?count=false&page=2')
+        assert len(data['results']) == 1
+        assert data['next'] is None and data['previous'] is not None
+        for page in ('3', 'last', 'abc'):
+            response = APIClient().get(
+                f'{self.TITLES_URL}?count=false&page={page}'
+            )
+            assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_users_count_follows_changes(self, admin_client):
+        url = '/api/v1/users/'
+        assert admin_client.get(url).json()['count'] == 1
+        for idx in range(10):
+            response = admin_client.post(url, data={
+                'username': f'user{idx}', 'email': f'user{idx}@yamdb.fake'
+            })
+            assert response.status_code == HTTPStatus.CREATED
+        data = admin_client.get(f'{url}?page=2').json()
+        assert data['count'] == 11, (
+            'Проверьте, что количество пользователей в списке меняется '
+            'сразу после создания пользователей.'
+        )
+        assert len(data['results']) == 1
+        admin_client.delete(f'{url}user0/')
+        data = admin_client.get(url).json()
+        assert data['count'] == 10 and data['next'] is None
@@ -0,0 +1,161 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+
+
+@pytest.fixture
+def rates(settings):
+    def set_rates(**scopes):
+        rates = {'auth_ip': None, 'auth_username': None, 'auth_email': None}
+        rates.update(scopes)
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates
+        }
+    return set_rates
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    from api.throttling import SlidingWindowThrottle
+    now = [1_000_000.0]
+    monkeypatch.setattr(
+        SlidingWindowThrottle, 'timer', staticmethod(lambda: now[0])
+    )
+    return now
+
+
+def signup(username, email, address='10.0.0.1'):
+    return APIClient(REMOTE_ADDR=address).post(
+        SIGNUP_URL, data={'username': username, 'email': email}
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29AuthThrottling:
+
+    def test_01_ip(self, rates, clock):
+        rates(auth_ip='3/min')
+        client = APIClient(REMOTE_ADDR='10.0.0.1')
+        for _ in range(3):
+            response = client.post(TOKEN_URL, data={'username': 'nobody'})
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.post(TOKEN_URL, data={'username': 'nobody'})
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запросы к `/api/v1/auth/token/` с одного адреса '
+            'сверх лимита отклоняются со статусом 429.'
+        )
+        # The clock is 40 seconds into a minute window.
+        assert int(response['Retry-After']) == 20, (
+            'Проверьте, что ответ 429 содержит заголовок `Retry-After`.'
+        )
+        assert signup('first', 'first@yamdb.fake').status_code == (
+            HTTPStatus.OK
+        ), 'Проверьте, что у регистрации и получения токена разные лимиты.'
+        other = APIClient(REMOTE_ADDR='10.0.0.2')
+        response = other.post(TOKEN_URL, data={'username': 'nobody'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_username_and_email(self, rates, clock, django_user_model):
+        rates(auth_username='2/hour', auth_email='2/hour')
+        for idx in range(2):
+            response = signup('user', 'user@yamdb.fake', f'10.0.1.{idx}')
+            assert response.status_code == HTTPStatus.OK
+        response = signup('User ', 'other@yamdb.fake', '10.0.1.9')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что регистрация ограничена для имени пользователя '
+            'независимо от адреса клиента.'
+        )
+        response = signup('other', 'USER@yamdb.fake', '10.0.1.9')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что регистрация ограничена для адреса почты.'
+        )
+        assert signup('other', 'other@yamdb.fake').status_code == (
+            HTTPStatus.OK
+        )
+        assert django_user_model.objects.count() == 2
+
+    def test_03_sliding_window(self, rates, clock):
+        rates(auth_ip='4/min')
+        client = APIClient()
+
+        def status():
+            return client.post(TOKEN_URL, data={}).status_code
+
+        # 50 seconds into a minute window.
+        clock[0] = 60 * 1000 + 50
+        assert [status() for _ in range(4)] == [HTTPStatus.BAD_REQUEST] * 4
+        response = client.post(TOKEN_URL, data={})
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        assert int(response['Retry-After']) == 10
+        # 10 seconds into the next window 5/6 of the previous one count.
+        clock[0] += 20
+        assert status() == HTTPStatus.BAD_REQUEST
+        response = client.post(TOKEN_URL, data={})
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запросы прошлого окна учитываются по доле, '
+            'попавшей в скользящее окно.'
+        )
+        assert int(response['Retry-After']) == 5
+        clock[0] += 6
+        assert status() == HTTPStatus.BAD_REQUEST
+
+    def test_04_disabled(self, rates):
+        rates()
+        client = APIClient()
+        for _ in range(30):
+            assert client.post(TOKEN_URL, data={}).status_code == (
+                HTTPStatus.BAD_REQUEST
+            )
+
+    def test_05_forwarded_for_is_not_trusted(self, rates, clock, settings):
+        rates(auth_ip='2/min')
+        client = APIClient(REMOTE_ADDR='10.0.0.1')
+        statuses = [
+            client.post(
+                TOKEN_URL, data={}, HTTP_X_FORWARDED_FOR=f'192.0.2.{idx}'
+            ).status_code
+            for idx in range(3)
+        ]
+        assert statuses[-1] == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что подменённый заголовок `X-Forwarded-For` не '
+            'сбрасывает лимит запросов с одного адреса.'
+        )
+
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK, 'NUM_PROXIES': 1
+        }
+        # The exhausted address is now a proxy forwarding another client.
+        response = client.post(
+            TOKEN_URL, data={}, HTTP_X_FORWARDED_FOR='198.51.100.7'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что за доверенным прокси адрес клиента берётся '
+            'из `X-Forwarded-For`.'
+        )
+
+    def test_06_counter_expired_before_incr(self):
+        from api.throttling import IPAuthThrottle
+
+        class ExpiringCache:
+            def __init__(self):
+                self.added = []
+
+            def add(self, key, value, timeout):
+                self.added.append(key)
+                return len(self.added) > 1
+
+            def incr(self, key):
+                raise ValueError(f'Key {key} not found')
+
+        throttle = IPAuthThrottle()
+        throttle.key, throttle.duration = 'api:throttle:test:1', 60
+        cache = ExpiringCache()
+        throttle.count_request(cache)
+        assert cache.added == ['api:throttle:test:1'] * 2, (
+            'Проверьте, что счётчик, истёкший между add() и incr(), '
+            'создаётся заново вместо ошибки.'
+        )